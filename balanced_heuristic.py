@@ -1,120 +1,117 @@
 # balanced_heuristic.py
 import numpy as np
 import random
+from array import array
+from game_state import HEADS, SIDE_MASKS, iter_holes, mask_to_holes, sow, sowing_path, take_stones
+
+
+class _ScoreTotal:
+    """Stands in for the per-term dict when no breakdown is wanted: only sums the terms"""
+    __slots__ = ("total",)
+
+    def __init__(self):
+        self.total = 0
+
+    def __setitem__(self, term, value):
+        self.total += value
+
+
+class _Position:
+    """Pre-move facts of a position, read once and shared by every hole scored from it"""
+    __slots__ = ("board", "burned_mask", "side_totals", "occupied_mask", "zobrist_hash")
+
+    def __init__(self, game):
+        self.board = game.board
+        self.burned_mask = game.burned_mask
+        self.side_totals = game.side_totals
+        self.occupied_mask = game.occupied_mask
+        self.zobrist_hash = game.zobrist_hash
+
 
 class SungkaHeuristic:
+    """
+    Move scoring. evaluate() and the helpers only read the position they are
+    given, so one instance can be shared between threads (see evaluate_move).
+    """
     def __init__(self, game):
         self.original_game = game
 
-    def simulate_move_complete(self, game, hole):
-        """Complete move simulation with proper burned hole handling and relay"""
-        board = game.board.copy()
-        current_player = game.current_player
-        burned_holes = {0: set(game.burned_holes[0]), 1: set(game.burned_holes[1])}
+    def simulate_move_complete(self, game, hole, player=None, position=None):
+        """
+        Complete move simulation with proper burned hole handling and relay.
+        position (a _Position of game) means hole is known to be legal: the
+        check is skipped and the pre-move facts are taken from it.
+        """
+        current_player = game.current_player if player is None else player
+        if position is None:
+            if not game.legal_mask(current_player) >> hole & 1:
+                return None
+            position = _Position(game)
+        board = position.board.copy()
+        burned_mask = position.burned_mask
 
-        if hole in burned_holes[current_player]:
-            return None
-        if not ((current_player == 0 and 0 <= hole <= 6 and board[hole] > 0) or
-                (current_player == 1 and 8 <= hole <= 14 and board[hole] > 0)):
-            return None
-
-        originally_empty = set(i for i in range(16) if board[i] == 0)
+        # Side totals and occupied pits are carried along instead of re-summed;
+        # a side pit was originally empty iff its bit is clear in the occupied mask
+        originally_occupied = position.occupied_mask
+        counts = [*position.side_totals, originally_occupied]
         
         total_captured = 0
         extra_turns = 0
         burns_created = 0
         
-        def distribute_from_hole(start_hole):
-            nonlocal total_captured, extra_turns, burns_created
-            
-            stones = board[start_hole]
-            board[start_hole] = 0
-            current_hole = start_hole
+        last_hole, relay_count = sow(board, hole, current_player, burned_mask, counts=counts)
 
-            while stones > 0:
-                current_hole = (current_hole + 1) % 16
-                
-                # Skip opponent's head
-                if (current_player == 0 and current_hole == 15) or (current_player == 1 and current_hole == 7):
-                    continue
-                    
-                # Skip burned holes
-                if current_hole in burned_holes[0] or current_hole in burned_holes[1]:
-                    continue
-                    
-                board[current_hole] += 1
-                stones -= 1
+        # Check for extra turn
+        if last_hole == HEADS[current_player]:
+            extra_turns += 1
 
-            # Check for extra turn
-            if (current_player == 0 and current_hole == 7) or (current_player == 1 and current_hole == 15):
-                extra_turns += 1
-                return current_hole, True
-            
-            # Check for relay (continue distribution)
-            if current_hole not in (7, 15) and board[current_hole] > 1:
-                return distribute_from_hole(current_hole)
-            
-            # Check for capture
-            if ((current_player == 0 and 0 <= current_hole <= 6 and board[current_hole] == 1) or
-                (current_player == 1 and 8 <= current_hole <= 14 and board[current_hole] == 1)):
-                opposite_hole = 14 - current_hole
-                if board[opposite_hole] > 0:
-                    # Capture occurs
-                    captured = board[current_hole] + board[opposite_hole]
-                    total_captured += captured
-                    head = 7 if current_player == 0 else 15
-                    board[head] += captured
-                    board[current_hole] = 0
-                    board[opposite_hole] = 0
-                elif board[opposite_hole] == 0:
-                    # Sunog occurs - but only if landing in originally empty hole
-                    if current_hole in originally_empty:
-                        seeds = board[current_hole]
-                        board[current_hole] = 0
-                        opponent_head = 15 if current_player == 0 else 7
-                        board[opponent_head] += seeds
-                        burned_holes[current_player].add(current_hole)
-                        burns_created += 1
-
-            return current_hole, False
+        # Check for capture
+        elif ((current_player == 0 and 0 <= last_hole <= 6 and board[last_hole] == 1) or
+              (current_player == 1 and 8 <= last_hole <= 14 and board[last_hole] == 1)):
+            opposite_hole = 14 - last_hole
+            if board[opposite_hole] > 0:
+                # Capture occurs
+                captured = take_stones(board, counts, last_hole) + take_stones(board, counts, opposite_hole)
+                total_captured += captured
+                head = 7 if current_player == 0 else 15
+                board[head] += captured
+            elif board[opposite_hole] == 0:
+                # Sunog occurs - but only if landing in originally empty hole
+                if not originally_occupied >> last_hole & 1:
+                    seeds = take_stones(board, counts, last_hole)
+                    opponent_head = 15 if current_player == 0 else 7
+                    board[opponent_head] += seeds
+                    burned_mask |= 1 << last_hole
+                    burns_created += 1
 
-        last_hole, got_extra_turn = distribute_from_hole(hole)
-        
         return {
             'board': board,
-            'burned_holes': burned_holes,
+            'burned_mask': burned_mask,
             'total_captured': total_captured,
             'extra_turns': extra_turns,
             'burns_created': burns_created,
-            'last_hole': last_hole
+            'last_hole': last_hole,
+            'relay_count': relay_count,
+            'side_totals': (counts[0], counts[1]),
+            'occupied_mask': counts[2]
         }
 
-    def analyze_opponent_threats(self, game, board_after, evaluating_player):
+    def analyze_opponent_threats(self, game, board_after, evaluating_player, occupied_mask=None, burned_mask=None):
         """Analyze immediate threats from opponent relative to evaluating player"""
         opponent = 1 - evaluating_player
         threat_score = 0
         
-        opponent_range = range(8, 15) if evaluating_player == 0 else range(0, 7)
-        my_range = range(0, 7) if evaluating_player == 0 else range(8, 15)
+        if occupied_mask is None:
+            occupied_mask = sum(1 << i for i in range(16) if board_after[i] > 0)
+        if burned_mask is None:
+            burned_mask = game.burned_mask
         
-        for opp_hole in opponent_range:
-            if board_after[opp_hole] == 0 or opp_hole in game.burned_holes[opponent]:
-                continue
-                
-            stones = board_after[opp_hole]
-            
-            # Simple simulation of opponent's potential move
-            current_hole = opp_hole
-            temp_stones = stones
-            
-            while temp_stones > 0:
-                current_hole = (current_hole + 1) % 16
-                
-                # Skip our head
-                if (opponent == 0 and current_hole == 15) or (opponent == 1 and current_hole == 7):
-                    continue
-                    
-                temp_stones -= 1
+        # Simple simulation of opponent's potential move: only our head is skipped
+        # (burned holes are ignored here), i.e. the sowing path for an empty burned mask
+        opponent_path = sowing_path(opponent, 0)
+        
+        for opp_hole in iter_holes(occupied_mask & SIDE_MASKS[opponent] & ~burned_mask):
+            current_hole = opponent_path.landing(opp_hole, board_after[opp_hole])
             
             # Check what opponent could achieve
             if ((opponent == 0 and current_hole == 7) or (opponent == 1 and current_hole == 15)):
@@ -127,18 +124,18 @@ class SungkaHeuristic:
         
         return threat_score
 
-    def evaluate_endgame_strategy(self, game, board_after, evaluating_player):
+    def evaluate_endgame_strategy(self, game, board_after, evaluating_player, side_totals=None):
         """Balanced endgame evaluation for any player"""
+        if side_totals is None:
+            side_totals = (sum(board_after[0:7]), sum(board_after[8:15]))
         if evaluating_player == 0:
             my_head = board_after[7]
             opponent_head = board_after[15]
-            my_stones = sum(board_after[0:7])
-            opponent_stones = sum(board_after[8:15])
+            my_stones, opponent_stones = side_totals
         else:
             my_head = board_after[15]
             opponent_head = board_after[7]
-            my_stones = sum(board_after[8:15])
-            opponent_stones = sum(board_after[0:7])
+            opponent_stones, my_stones = side_totals
         
         total_remaining = my_stones + opponent_stones
         
@@ -163,20 +160,61 @@ class SungkaHeuristic:
         
         return 0
 
+    def variation_term(self, game_progress, rng):
+        """Smaller randomization to reduce deterministic play (0 without an rng)"""
+        if game_progress > 0.1 and rng is not None:
+            return rng.uniform(-1, 1)  # Reduced from (-2, 2)
+        return 0
+
+    def turn_balance_term(self, moves_played, evaluating_player):
+        """Turn order balance compensation"""
+        # Add slight compensation for second player to balance first-move advantage
+        turn_balance = 0
+        if moves_played < 4:  # Only in very early game
+            if evaluating_player == 1:  # Second player
+                turn_balance = 1  # Small bonus for second player in early game
+        return turn_balance
+
     def evaluate_move_verbose(self, hole):
+        """Score hole for the side to move in the wrapped game (global random for Variation)"""
         game = self.original_game
-        evaluating_player = game.current_player  # The player making this move
-        
+        return self.evaluate(game, hole, game.current_player, game.metrics['moves'], random)
+
+    def evaluate(self, game, hole, evaluating_player, moves_played=0, rng=None, verbose=True, cache=None,
+                 position=None):
+        """
+        Score hole for evaluating_player without modifying game (a SungkaState or
+        SungkaGame). moves_played drives the turn-balance term; rng (anything
+        with uniform(a, b)) drives the Variation term, which is 0 when rng is None.
+        With verbose=False no per-term dict is built and details is None.
+        cache (an EvaluationCache) is only used for non-verbose calls.
+        position is the _Position evaluate_all_moves shares between holes (hole
+        is then known to be legal); single calls check the hole and read their own.
+        """
+        if position is None:
+            if not game.legal_mask(evaluating_player) >> hole & 1:
+                return -float('inf'), {"Error": "Invalid move"}
+            position = _Position(game)
+        if verbose:
+            cache = None
+        elif cache is not None:
+            key = (position.zobrist_hash, hole, evaluating_player)
+            cached = cache.get(key)
+            if cached is not None:
+                prefix, game_progress = cached
+                total_score = prefix + self.variation_term(game_progress, rng)
+                return total_score + self.turn_balance_term(moves_played, evaluating_player), None
+
         # Simulate the complete move
-        result = self.simulate_move_complete(game, hole)
-        if result is None:
-            return -float('inf'), {"Error": "Invalid move"}
+        result = self.simulate_move_complete(game, hole, evaluating_player, position)
 
         board_after = result['board']
-        scores = {}
+        side_totals = result['side_totals']
+        my_occupied = result['occupied_mask'] & SIDE_MASKS[evaluating_player]
+        scores = {} if verbose else _ScoreTotal()
         
         # Calculate game progress
-        total_stones_on_board = sum(board_after[i] for i in range(16) if i not in (7, 15))
+        total_stones_on_board = side_totals[0] + side_totals[1]
         game_progress = 1 - (total_stones_on_board / 98)
         
         # 1. Immediate tactical gains (always positive for good moves)
@@ -192,14 +230,12 @@ class SungkaHeuristic:
         if evaluating_player == 0:
             my_head = board_after[7]
             opponent_head = board_after[15]
-            my_stones = sum(board_after[0:7])
-            opponent_stones = sum(board_after[8:15])
+            my_stones, opponent_stones = side_totals
             my_range = range(0, 7)
         else:
             my_head = board_after[15]
             opponent_head = board_after[7]
-            my_stones = sum(board_after[8:15])
-            opponent_stones = sum(board_after[0:7])
+            opponent_stones, my_stones = side_totals
             my_range = range(8, 15)
         
         head_diff = my_head - opponent_head
@@ -211,7 +247,7 @@ class SungkaHeuristic:
             scores['Material Control'] = material_diff * 2  # Reduced from 3
             
             # Balanced development scoring
-            active_holes = sum(1 for i in my_range if board_after[i] > 0)
+            active_holes = my_occupied.bit_count()
             if active_holes >= 5:
                 scores['Development'] = 5  # Reduced from 8
             elif active_holes <= 2:
@@ -220,7 +256,7 @@ class SungkaHeuristic:
                 scores['Development'] = 0
                 
         elif game_progress > 0.6:  # Late game
-            endgame_score = self.evaluate_endgame_strategy(game, board_after, evaluating_player)
+            endgame_score = self.evaluate_endgame_strategy(game, board_after, evaluating_player, side_totals)
             scores['Endgame Strategy'] = endgame_score
             scores['Material Control'] = material_diff * 0.8  # Reduced from 1
             
@@ -229,18 +265,19 @@ class SungkaHeuristic:
             scores['Material Control'] = material_diff * 1.5  # Reduced from 2
             
             # Balanced mid-game tactical focus
-            active_holes = sum(1 for i in my_range if board_after[i] > 0)
+            active_holes = my_occupied.bit_count()
             if active_holes >= 3:
                 scores['Flexibility'] = 3  # Reduced from 5
             else:
                 scores['Flexibility'] = -5  # Reduced penalty from -8
         
         # 3. Balanced threat analysis
-        threat_score = self.analyze_opponent_threats(game, board_after, evaluating_player)
+        threat_score = self.analyze_opponent_threats(game, board_after, evaluating_player, result['occupied_mask'],
+                                                     position.burned_mask)
         scores['Threat Analysis'] = threat_score
         
         # 4. Balanced move efficiency
-        stones_used = game.board[hole]
+        stones_used = position.board[hole]
         efficiency_score = 0
         
         # Reward efficient captures and extra turns
@@ -264,9 +301,7 @@ class SungkaHeuristic:
         tactical_score = 0
         
         # Count immediate capture opportunities after this move
-        for next_hole in my_range:
-            if board_after[next_hole] == 0 or next_hole in game.burned_holes[evaluating_player]:
-                continue
+        for next_hole in iter_holes(my_occupied & ~position.burned_mask):
             next_stones = board_after[next_hole]
             landing = (next_hole + next_stones) % 16
             
@@ -284,27 +319,63 @@ class SungkaHeuristic:
                         tactical_score += board_after[opposite] * 0.3  # Reduced from 0.5
         
         scores['Tactical Setup'] = tactical_score
+        if cache is not None:
+            # Running total of every term fixed by the position and hole
+            prefix = scores.total
         
-        # 6. Smaller randomization to reduce deterministic play
-        if game_progress > 0.1:
-            randomization = random.uniform(-1, 1)  # Reduced from (-2, 2)
-            scores['Variation'] = randomization
-        else:
-            scores['Variation'] = 0
-        
-        # 7. Turn order balance compensation
-        # Add slight compensation for second player to balance first-move advantage
-        turn_balance = 0
-        if game.metrics['moves'] < 4:  # Only in very early game
-            if evaluating_player == 1:  # Second player
-                turn_balance = 1  # Small bonus for second player in early game
-        scores['Turn Balance'] = turn_balance
+        # 6./7. Variation and turn balance (never cached: they depend on the rng
+        # and on how many moves were played)
+        scores['Variation'] = self.variation_term(game_progress, rng)
+        scores['Turn Balance'] = self.turn_balance_term(moves_played, evaluating_player)
         
         # Total score calculation
+        if not verbose:
+            if cache is not None:
+                cache.put(key, (prefix, game_progress))
+            return scores.total, None
         total_score = sum(scores.values())
         
         # Add context info
         scores['Stones Used'] = stones_used
         scores['Total Score'] = total_score
         
-        return total_score, scores
\ No newline at end of file
+        return total_score, scores
+
+    def evaluate_all_moves(self, game, player=None, moves_played=0, rng=None, verbose=False, cache=None):
+        """
+        Score every legal hole for player (default: side to move) in one pass.
+        Returns (moves, scores, details): ascending holes, an array('d') of their
+        total scores and, only when verbose, the per-term dicts (else None).
+        The legal mask, board, burned mask, side totals, occupied mask and hash
+        are read once; no hole re-checks its legality. Variation draws happen in
+        the same order as scoring the moves one by one.
+        """
+        if player is None:
+            player = game.current_player
+        moves = mask_to_holes(game.legal_mask(player))
+        position = _Position(game)
+        scores = array('d')
+        details = [] if verbose else None
+        for hole in moves:
+            score, terms = self.evaluate(game, hole, player, moves_played, rng, verbose, cache, position)
+            scores.append(score)
+            if verbose:
+                details.append(terms)
+        return moves, scores, details
+
+
+# Shared evaluator: SungkaHeuristic keeps no per-call state
+_EVALUATOR = SungkaHeuristic(None)
+
+
+def evaluate_move(state, hole, player, moves_played=0, rng=None, verbose=True, cache=None):
+    """
+    Stateless entry point: (total_score, details) for player sowing from hole.
+    state is read, never written, so decisions can run concurrently.
+    """
+    return _EVALUATOR.evaluate(state, hole, player, moves_played, rng, verbose, cache)
+
+
+def evaluate_all_moves(state, player=None, moves_played=0, rng=None, verbose=False, cache=None):
+    """Stateless batch entry point: (moves, scores, details) for every legal hole"""
+    return _EVALUATOR.evaluate_all_moves(state, player, moves_played, rng, verbose, cache)
@@ -0,0 +1,484 @@
+# batch_engine.py
+"""
+Batched NumPy Sungka engine: advances thousands of games in lockstep.
+
+N boards live in one (N, 16) integer array with the same layout as SungkaGame
+(0-6 / 7 / 8-14 / 15) and burned holes in an (N,) bitmask array (bit i set
+means hole i is burned, as in game_state.SungkaState). step() plays one hole
+per unfinished game, including relay sowing, capture, Sunog, extra turns and
+end-of-game collection; finished games are masked out.
+
+Game-ending rules follow Simulator.simulate_single_game exactly:
+  - after an extra turn, a game whose mover has an empty side stops without
+    collecting (the loop's is_game_over() check),
+  - after a normal move, if the new side to move is empty the remaining stones
+    are collected (play_turn's result.game_over),
+  - a game stops once it reaches max_moves_per_game.
+
+The batch policies (BATCH_POLICIES) take the (N, 16) boards, (N,) burned
+masks and (N,) players to move and return N holes (-1 when a game has no
+legal move). They choose exactly what the scalar bots in
+complete_working_simulator choose; random_moves does so when it is given one
+random.Random per game seeded like the scalar RandomBot's.
+
+Run this file to compare batch matchups against the reference engine:
+    python batch_engine.py --bot-a max --bot-b random --games 20000
+or to check the batch policies move-for-move against the scalar bots:
+    python batch_engine.py --parity 20000
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+
+from game_state import HEADS, INITIAL_BOARD
+
+HOLE_INDEX = np.arange(16)
+HEAD_INDEX = np.array(HEADS)
+OFFSETS = np.arange(1, 17)  # sowing order after a start pit; offset 16 is the start pit itself
+SIDE_PITS = np.zeros((2, 16), dtype=bool)
+SIDE_PITS[0, 0:7] = True
+SIDE_PITS[1, 8:15] = True
+
+# RealisticBasicRuleBot's fallback scores: hole position part per player
+POSITION_SCORE = np.zeros((2, 16), dtype=np.int64)
+POSITION_SCORE[0, [2, 3, 4]] = 5
+POSITION_SCORE[0, [0, 6]] = -3
+POSITION_SCORE[1, [10, 11, 12]] = 5
+POSITION_SCORE[1, [8, 14]] = -3
+
+
+def burned_bits(burned):
+    """(N,) burned masks -> (N, 16) bool array"""
+    return (burned[:, None] >> HOLE_INDEX & 1).astype(bool)
+
+
+def valid_move_mask(boards, burned, players):
+    """(N, 16) bool array of legal holes for each game's side to move"""
+    return SIDE_PITS[players] & (boards > 0) & ~burned_bits(burned)
+
+
+def eligible_pits(burned, players):
+    """(N, 16) bool array of pits that receive stones: not burned, not the opponent's head"""
+    eligible = ~burned_bits(burned)
+    eligible[np.arange(len(players)), HEAD_INDEX[1 - players]] = False
+    return eligible
+
+
+def distance_to_head(burned, players):
+    """
+    (N, 16) stones needed from each hole of the mover's side for the last one to
+    land in the mover's head (sowing path skips burned holes and the opponent's head).
+    """
+    eligible = eligible_pits(burned, players)
+    passed = np.cumsum(eligible, axis=1)
+    heads = HEAD_INDEX[players]
+    head_count = passed[np.arange(len(players)), heads]
+    # Own-side holes all sit below their head, so no wrap-around is needed
+    return head_count[:, None] - passed
+
+
+def landing_holes(boards, burned, players):
+    """
+    (N, 16) pit that receives the last stone when each hole is sown by the
+    side to move (no relay), for every game and hole at once; same as
+    SowingPath.landing. Empty holes land on themselves.
+    """
+    eligible = eligible_pits(burned, players)
+    cycle_length = eligible.sum(axis=1, keepdims=True)
+    # Eligible pits in sowing order from hole 0 (stable sort keeps index order)
+    active = np.argsort(~eligible, axis=1, kind='stable')
+    # Index into active of the first pit sown after each hole
+    first_index = np.cumsum(eligible, axis=1) % cycle_length
+    step = (first_index + boards - 1) % cycle_length
+    return np.where(boards > 0, np.take_along_axis(active, step, axis=1), HOLE_INDEX)
+
+
+def capture_mask(boards, burned, players, landing=None):
+    """
+    (N, 16) holes whose sowing ends in an empty pit on the mover's side with
+    stones opposite (RealisticBasicRuleBot.can_capture, judged on the board
+    before the move)
+    """
+    if landing is None:
+        landing = landing_holes(boards, burned, players)
+    own_side = SIDE_PITS[players[:, None], landing]
+    landed_on = np.take_along_axis(boards, landing, axis=1)
+    opposite = np.take_along_axis(boards, (14 - landing) % 16, axis=1)
+    return own_side & (landed_on == 0) & (opposite > 0)
+
+
+def extra_turn_mask(boards, burned, players, landing=None):
+    """(N, 16) holes whose last stone lands in the mover's head (RealisticBasicRuleBot.gives_extra_turn)"""
+    if landing is None:
+        landing = landing_holes(boards, burned, players)
+    return landing == HEAD_INDEX[players][:, None]
+
+
+def random_moves(boards, burned, players, rng):
+    """
+    RandomBot: uniform choice among legal holes (-1 when there is none).
+    rng is a NumPy Generator (fully vectorised, independent draws) or one
+    random.Random per game; the latter draws exactly like RandomBot.get_move
+    (rng.choice over the ascending legal holes), so the same streams give the
+    same moves.
+    """
+    valid = valid_move_mask(boards, burned, players)
+    has_move = valid.any(axis=1)
+    if isinstance(rng, np.random.Generator):
+        scores = np.where(valid, rng.random(valid.shape), -1.0)
+        return np.where(has_move, scores.argmax(axis=1), -1)
+    counts = valid.sum(axis=1)
+    # One draw per game from its own stream; picking the k-th legal hole is vectorised
+    picks = np.array([game_rng.choice(range(count)) if count else 0
+                      for game_rng, count in zip(rng, counts.tolist())], dtype=np.int64)
+    chosen = valid & (np.cumsum(valid, axis=1) == picks[:, None] + 1)
+    return np.where(has_move, chosen.argmax(axis=1), -1)
+
+
+def max_policy_moves(boards, burned, players, rng=None):
+    """MaxPolicyBot: legal hole with the most stones (lowest index on ties)"""
+    valid = valid_move_mask(boards, burned, players)
+    scores = np.where(valid, boards, -1)
+    return np.where(valid.any(axis=1), scores.argmax(axis=1), -1)
+
+
+def exact_policy_moves(boards, burned, players, rng=None):
+    """
+    ExactPolicyBot: a hole whose stones exactly reach the head (nearest to the
+    head wins), otherwise the Max Policy choice.
+    """
+    valid = valid_move_mask(boards, burned, players)
+    exact = valid & (boards == distance_to_head(burned, players))
+    # Nearest to head: highest index for Player 1, lowest for Player 2
+    nearest_p1 = 15 - np.argmax(exact[:, ::-1], axis=1)
+    nearest_p2 = np.argmax(exact, axis=1)
+    nearest = np.where(players == 0, nearest_p1, nearest_p2)
+    fallback = max_policy_moves(boards, burned, players)
+    return np.where(exact.any(axis=1), nearest, fallback)
+
+
+def basic_rule_moves(boards, burned, players, rng=None):
+    """
+    RealisticBasicRuleBot: the lowest capturing hole, else the extra-turn hole
+    with the fewest stones, else the best stone-count + position score (lowest
+    hole on ties)
+    """
+    valid = valid_move_mask(boards, burned, players)
+    landing = landing_holes(boards, burned, players)
+    captures = valid & capture_mask(boards, burned, players, landing)
+    extra_turns = valid & extra_turn_mask(boards, burned, players, landing)
+
+    fewest_stones = np.where(extra_turns, boards, np.iinfo(boards.dtype).max).argmin(axis=1)
+    stone_score = np.select([(boards >= 4) & (boards <= 8), boards <= 2, boards >= 12], [10, -5, -8], 0)
+    scores = np.where(valid, stone_score + POSITION_SCORE[players], np.iinfo(POSITION_SCORE.dtype).min)
+    best_scored = scores.argmax(axis=1)
+
+    moves = np.where(extra_turns.any(axis=1), fewest_stones, best_scored)
+    moves = np.where(captures.any(axis=1), captures.argmax(axis=1), moves)
+    return np.where(valid.any(axis=1), moves, -1)
+
+
+BATCH_POLICIES = {
+    'random': random_moves,
+    'max': max_policy_moves,
+    'exact': exact_policy_moves,
+    'basic': basic_rule_moves,
+}
+
+
+class BatchSungkaEngine:
+    def __init__(self, num_games, first_players=None, max_moves_per_game=200):
+        self.num_games = num_games
+        self.max_moves_per_game = max_moves_per_game
+        self.boards = np.tile(np.array(INITIAL_BOARD, dtype=np.int32), (num_games, 1))
+        self.burned = np.zeros(num_games, dtype=np.int32)
+        if first_players is None:
+            first_players = np.zeros(num_games, dtype=np.int64)
+        self.current_player = np.asarray(first_players, dtype=np.int64).copy()
+        self.finished = np.zeros(num_games, dtype=bool)
+        self.move_counts = np.zeros(num_games, dtype=np.int64)
+
+    def active_rows(self):
+        return np.flatnonzero(~self.finished)
+
+    def valid_move_mask(self, rows=None):
+        if rows is None:
+            rows = np.arange(self.num_games)
+        return valid_move_mask(self.boards[rows], self.burned[rows], self.current_player[rows])
+
+    def side_totals(self):
+        return self.boards[:, 0:7].sum(axis=1), self.boards[:, 8:15].sum(axis=1)
+
+    def _sow(self, rows, start_holes):
+        """Sow (with relays) from start_holes for the games in rows; returns last holes"""
+        boards = self.boards
+        players = self.current_player[rows]
+        eligible = eligible_pits(self.burned[rows], players)
+        cycle_length = eligible.sum(axis=1)
+        own_heads = HEAD_INDEX[players]
+        current = np.array(start_holes, dtype=np.int64)
+        pending = np.arange(len(rows))
+
+        while pending.size:
+            game_rows = rows[pending]
+            start = current[pending]
+            pits = eligible[pending]
+            local = np.arange(len(pending))
+
+            stones = boards[game_rows, start]
+            boards[game_rows, start] = 0
+            # Full laps in one go, then the remainder along the sowing order
+            laps, remainder = np.divmod(stones, cycle_length[pending])
+            boards[game_rows] += laps[:, None] * pits
+            order = (start[:, None] + OFFSETS) % 16
+            in_order = pits[local[:, None], order]
+            rank = np.cumsum(in_order, axis=1)
+            boards[game_rows[:, None], order] += in_order & (rank <= remainder[:, None])
+
+            last_column = np.argmax(in_order & (rank == remainder[:, None]), axis=1)
+            landing = np.where(remainder > 0, order[local, last_column], start)
+            current[pending] = landing
+
+            relaying = (landing != own_heads[pending]) & (boards[game_rows, landing] > 1)
+            pending = pending[relaying]
+
+        return current
+
+    def step(self, holes):
+        """
+        Play holes[i] for every unfinished game i (entries for finished games are
+        ignored). Returns a bool array marking games that got an extra turn.
+        """
+        holes = np.asarray(holes)
+        rows = self.active_rows()
+        extra_turn = np.zeros(self.num_games, dtype=bool)
+        if rows.size == 0:
+            return extra_turn
+
+        boards = self.boards
+        players = self.current_player[rows]
+        moves = holes[rows]
+        if not self.valid_move_mask(rows)[np.arange(rows.size), moves].all():
+            raise ValueError("Invalid move in batch step")
+
+        last = self._sow(rows, moves)
+        own_heads = HEAD_INDEX[players]
+        extra = last == own_heads
+        extra_turn[rows] = extra
+
+        # Last stone in own (previously empty) hole: capture or Sunog, both burn it
+        terminal = ~extra & SIDE_PITS[players, last]
+        t_rows = rows[terminal]
+        t_last = last[terminal]
+        t_opposite = 14 - t_last
+        gained = boards[t_rows, t_last] + boards[t_rows, t_opposite]
+        boards[t_rows, own_heads[terminal]] += gained
+        boards[t_rows, t_last] = 0
+        boards[t_rows, t_opposite] = 0
+        self.burned[t_rows] |= 1 << t_last
+
+        self.move_counts[rows] += 1
+        switched = rows[~extra]
+        self.current_player[switched] = 1 - self.current_player[switched]
+
+        p1_stones, p2_stones = self.side_totals()
+        mover_side_empty = np.where(self.current_player == 0, p1_stones, p2_stones) == 0
+
+        # Extra turn with an empty side: the game stops without collecting
+        self.finished[rows[extra & mover_side_empty[rows]]] = True
+
+        # New side to move is empty: collect the other side into its owner's head
+        over = switched[mover_side_empty[switched]]
+        p1_collects = over[(p2_stones[over] == 0) & (p1_stones[over] > 0)]
+        p2_collects = over[(p1_stones[over] == 0) & (p2_stones[over] > 0)]
+        boards[p1_collects, 7] += p1_stones[p1_collects]
+        boards[p1_collects, 0:7] = 0
+        boards[p2_collects, 15] += p2_stones[p2_collects]
+        boards[p2_collects, 8:15] = 0
+        self.finished[over] = True
+
+        self.finished[rows[self.move_counts[rows] >= self.max_moves_per_game]] = True
+        return extra_turn
+
+    def winners(self):
+        """0 / 1 for the player with the bigger head, -1 for a draw"""
+        return np.where(self.boards[:, 7] > self.boards[:, 15], 0,
+                        np.where(self.boards[:, 15] > self.boards[:, 7], 1, -1))
+
+
+def run_batch_matchup(bot_a, bot_b, num_games=10000, seed=None, max_moves_per_game=200):
+    """
+    Play bot_a vs bot_b (names from BATCH_POLICIES) with random seats and a
+    random first mover per game. Returns a summary dict from bot_a's view.
+    """
+    rng = np.random.default_rng(seed)
+    policy_a = BATCH_POLICIES[bot_a]
+    policy_b = BATCH_POLICIES[bot_b]
+    a_seat = rng.integers(0, 2, num_games)
+    engine = BatchSungkaEngine(num_games, rng.integers(0, 2, num_games), max_moves_per_game)
+
+    start = time.time()
+    while not engine.finished.all():
+        rows = engine.active_rows()
+        holes = np.full(num_games, -1, dtype=np.int64)
+        a_turn = engine.current_player[rows] == a_seat[rows]
+        for policy, chosen in ((policy_a, rows[a_turn]), (policy_b, rows[~a_turn])):
+            if chosen.size:
+                holes[chosen] = policy(engine.boards[chosen], engine.burned[chosen],
+                                       engine.current_player[chosen], rng)
+        engine.step(holes)
+    elapsed = time.time() - start
+
+    winners = engine.winners()
+    return _summary(bot_a, bot_b, winners == a_seat, winners == 1 - a_seat, winners == -1,
+                    int(engine.move_counts.sum()), elapsed)
+
+
+def run_reference_matchup(bot_a, bot_b, num_games=1000, seed=None, max_moves_per_game=200):
+    """Same matchup on SungkaGame with the scalar bots, one game at a time"""
+    from main import SungkaGame
+    from complete_working_simulator import RandomBot, MaxPolicyBot, ExactPolicyBot, RealisticBasicRuleBot
+    bots = {'random': RandomBot, 'max': MaxPolicyBot, 'exact': ExactPolicyBot, 'basic': RealisticBasicRuleBot}
+
+    if seed is not None:
+        random.seed(seed)
+    a_wins = b_wins = draws = total_moves = 0
+    start = time.time()
+    for _ in range(num_games):
+        a_seat = random.randrange(2)
+        game = SungkaGame()
+        game.current_player = random.randrange(2)
+        players = {a_seat: bots[bot_a](a_seat), 1 - a_seat: bots[bot_b](1 - a_seat)}
+        moves = 0
+        while not game.is_game_over() and moves < max_moves_per_game:
+            move = players[game.current_player].get_move(game)
+            result = game.play_turn(move)
+            moves += 1
+            if result.game_over:
+                break
+        total_moves += moves
+        winner = game.get_winner()
+        if winner is None:
+            draws += 1
+        elif winner == a_seat:
+            a_wins += 1
+        else:
+            b_wins += 1
+    elapsed = time.time() - start
+    return _summary(bot_a, bot_b, a_wins, b_wins, draws, total_moves, elapsed)
+
+
+def sample_positions(num_positions, seed=None):
+    """Positions (SungkaState records) met in random games on the reference engine, burned holes included"""
+    from main import SungkaGame
+
+    rng = random.Random(seed)
+    records = []
+    while len(records) < num_positions:
+        game = SungkaGame()
+        game.current_player = rng.randrange(2)
+        while not game.is_game_over() and len(records) < num_positions:
+            legal = game.legal_mask()
+            if not legal:
+                break
+            records.append(game.to_bytes())
+            holes = [hole for hole in range(16) if legal >> hole & 1]
+            if game.play_turn(rng.choice(holes)).game_over:
+                break
+    return records
+
+
+def check_policy_parity(num_positions=20000, seed=1):
+    """
+    Compare every batch policy with its scalar bot on sampled positions; the
+    random policy gets one random.Random per position, seeded as the scalar
+    RandomBot's. Returns {policy: mismatches} and prints a summary.
+    """
+    from main import SungkaGame
+    from complete_working_simulator import RandomBot, MaxPolicyBot, ExactPolicyBot, RealisticBasicRuleBot
+
+    records = sample_positions(num_positions, seed)
+    games = [SungkaGame.from_bytes(record) for record in records]
+    # Same dtypes as BatchSungkaEngine
+    boards = np.array([game.board for game in games], dtype=np.int32)
+    burned = np.array([game.burned_mask for game in games], dtype=np.int32)
+    players = np.array([game.current_player for game in games], dtype=np.int64)
+
+    def streams():
+        return [random.Random(f"parity:{seed}:{index}") for index in range(len(games))]
+
+    scalar_bots = {
+        'random': lambda index, player, streams: RandomBot(player, streams[index]),
+        'max': lambda index, player, streams: MaxPolicyBot(player),
+        'exact': lambda index, player, streams: ExactPolicyBot(player),
+        'basic': lambda index, player, streams: RealisticBasicRuleBot(player),
+    }
+    mismatches = {}
+    for name, policy in BATCH_POLICIES.items():
+        batch_streams = streams()
+        start = time.perf_counter()
+        batch_moves = policy(boards, burned, players, batch_streams)
+        batch_time = time.perf_counter() - start
+
+        scalar_streams = streams()
+        start = time.perf_counter()
+        scalar_moves = [scalar_bots[name](index, game.current_player, scalar_streams).get_move(game)
+                        for index, game in enumerate(games)]
+        scalar_time = time.perf_counter() - start
+
+        mismatches[name] = int(np.sum(batch_moves != np.array(scalar_moves)))
+        print(f"{name:>6}: {mismatches[name]} mismatches in {len(games)} positions  "
+              f"(batch {batch_time*1000:.1f} ms, scalar {scalar_time*1000:.1f} ms)")
+    return mismatches
+
+
+def _summary(bot_a, bot_b, a_wins, b_wins, draws, total_moves, elapsed):
+    a_wins, b_wins, draws = int(np.sum(a_wins)), int(np.sum(b_wins)), int(np.sum(draws))
+    games = a_wins + b_wins + draws
+    return {
+        'bot_a': bot_a,
+        'bot_b': bot_b,
+        'games': games,
+        'a_wins': a_wins,
+        'b_wins': b_wins,
+        'draws': draws,
+        'a_win_rate': a_wins / games if games else 0.0,
+        'moves': total_moves,
+        'elapsed': elapsed,
+        'games_per_second': games / elapsed if elapsed > 0 else float('inf'),
+    }
+
+
+def print_summary(label, summary):
+    print(f"{label}: {summary['bot_a']} vs {summary['bot_b']}  games={summary['games']}  "
+          f"A wins {summary['a_win_rate']*100:.1f}%  draws {summary['draws']}  "
+          f"({summary['games_per_second']:.0f} games/s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Batched Sungka matchups with a reference-engine parity check")
+    parser.add_argument("--bot-a", choices=sorted(BATCH_POLICIES), default="max")
+    parser.add_argument("--bot-b", choices=sorted(BATCH_POLICIES), default="random")
+    parser.add_argument("--games", type=int, default=20000)
+    parser.add_argument("--reference-games", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--parity", type=int, default=0, metavar="POSITIONS",
+                        help="check every batch policy against its scalar bot on this many positions and exit")
+    args = parser.parse_args()
+
+    if args.parity:
+        check_policy_parity(args.parity, args.seed)
+        raise SystemExit
+
+    batch = run_batch_matchup(args.bot_a, args.bot_b, args.games, args.seed)
+    print_summary("Batch engine    ", batch)
+    if args.reference_games:
+        reference = run_reference_matchup(args.bot_a, args.bot_b, args.reference_games, args.seed)
+        print_summary("Reference engine", reference)
+        # Two-proportion z score for the win-rate difference
+        p1, n1, p2, n2 = batch['a_win_rate'], batch['games'], reference['a_win_rate'], reference['games']
+        pooled = (batch['a_wins'] + reference['a_wins']) / (n1 + n2)
+        se = (pooled * (1 - pooled) * (1 / n1 + 1 / n2)) ** 0.5
+        print(f"Win-rate difference: {(p1 - p2)*100:+.2f} pp (z = {(p1 - p2) / se if se else 0.0:+.2f})")
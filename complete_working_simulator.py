@@ -1,19 +1,36 @@
 # complete_working_simulator.py
 from main import SungkaGame
-from more_balanced_heuristic import SungkaHeuristic  # Change this to your heuristic file
+from more_balanced_heuristic import evaluate_all_moves  # Change this to your heuristic file
 from game_logger import GameLogger
+from evaluation_cache import EvaluationCache
+from search_bot import AlphaBetaBot
+from mcts_bot import MCTSBot, MCTSStats
+from result_sink import CSVResultSink
+from run_telemetry import RunTelemetry
+from latency_histogram import LatencyRecorder, game_phase
+from sprt import SPRT, PairSPRT, elo_from_score
+from game_state import SIDE_MASKS, iter_holes, mask_to_holes, sowing_path
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import json
+import math
+import signal
+import sys
 import time
 import random
 import pandas as pd
 import os
 
 class RandomBot:
-    def __init__(self, player_index):
+    def __init__(self, player_index, rng=None):
         self.player_index = player_index
+        # Per-game random.Random stream (falls back to the global random module)
+        self.rng = rng if rng is not None else random
     
     def get_move(self, game):
-        valid_moves = game.get_valid_moves(self.player_index)
-        return random.choice(valid_moves) if valid_moves else None
+        legal = game.legal_mask(self.player_index)
+        return self.rng.choice(mask_to_holes(legal)) if legal else None
 
 class MaxPolicyBot:
     """Always chooses the house with the most stones"""
@@ -21,12 +38,12 @@ class MaxPolicyBot:
         self.player_index = player_index
     
     def get_move(self, game):
-        valid_moves = game.get_valid_moves(self.player_index)
-        if not valid_moves:
+        legal = game.legal_mask(self.player_index)
+        if not legal:
             return None
         
         # Find the move with the most stones
-        return max(valid_moves, key=lambda move: game.board[move])
+        return max(iter_holes(legal), key=lambda move: game.board[move])
 
 class ExactPolicyBot:
     """Chooses house where stones equal distance to head for extra turn"""
@@ -34,14 +51,14 @@ class ExactPolicyBot:
         self.player_index = player_index
     
     def get_move(self, game):
-        valid_moves = game.get_valid_moves(self.player_index)
-        if not valid_moves:
+        legal = game.legal_mask(self.player_index)
+        if not legal:
             return None
         
         head_position = 7 if self.player_index == 0 else 15
         exact_moves = []
         
-        for move in valid_moves:
+        for move in iter_holes(legal):
             stones = game.board[move]
             # Calculate distance to head, accounting for skipped holes
             distance_to_head = self._calculate_distance_to_head(game, move, head_position)
@@ -57,36 +74,12 @@ class ExactPolicyBot:
                 return min(exact_moves)  # Nearest to head for P2
         
         # Fallback to Max Policy
-        return max(valid_moves, key=lambda move: game.board[move])
+        return max(iter_holes(legal), key=lambda move: game.board[move])
     
     def _calculate_distance_to_head(self, game, start_hole, head_position):
         """Calculate actual distance considering skipped holes"""
-        current_hole = start_hole
-        distance = 0
-        
-        while True:
-            current_hole = (current_hole + 1) % 16
-            
-            # Skip opponent's head
-            if (self.player_index == 0 and current_hole == 15) or \
-               (self.player_index == 1 and current_hole == 7):
-                continue
-                
-            # Skip burned holes
-            if (current_hole in game.burned_holes[0] or 
-                current_hole in game.burned_holes[1]):
-                continue
-            
-            distance += 1
-            
-            if current_hole == head_position:
-                break
-                
-            # Prevent infinite loop
-            if distance > 20:
-                break
-        
-        return distance
+        # The cached sowing path already skips the opponent's head and burned holes
+        return sowing_path(self.player_index, game.burned_mask).steps_to(start_hole, head_position)
 
 class RealisticBasicRuleBot:
     """Bot that uses actual basic Sungka strategy"""
@@ -94,7 +87,7 @@ class RealisticBasicRuleBot:
         self.player_index = player_index
     
     def get_move(self, game):
-        valid_moves = game.get_valid_moves(self.player_index)
+        valid_moves = mask_to_holes(game.legal_mask(self.player_index))
         if not valid_moves:
             return None
         
@@ -145,24 +138,7 @@ class RealisticBasicRuleBot:
     
     def can_capture(self, game, hole):
         """Check if this move leads to a capture"""
-        stones = game.board[hole]
-        current_hole = hole
-        
-        # Simple simulation
-        while stones > 0:
-            current_hole = (current_hole + 1) % 16
-            
-            # Skip opponent's head
-            if (self.player_index == 0 and current_hole == 15) or \
-               (self.player_index == 1 and current_hole == 7):
-                continue
-                
-            # Skip burned holes
-            if (current_hole in game.burned_holes[0] or 
-                current_hole in game.burned_holes[1]):
-                continue
-                
-            stones -= 1
+        current_hole = sowing_path(self.player_index, game.burned_mask).landing(hole, game.board[hole])
         
         # Check if we land in our own empty hole with stones in opposite
         if ((self.player_index == 0 and 0 <= current_hole <= 6) or
@@ -175,23 +151,7 @@ class RealisticBasicRuleBot:
     
     def gives_extra_turn(self, game, hole):
         """Check if this move gives an extra turn"""
-        stones = game.board[hole]
-        current_hole = hole
-        
-        while stones > 0:
-            current_hole = (current_hole + 1) % 16
-            
-            # Skip opponent's head
-            if (self.player_index == 0 and current_hole == 15) or \
-               (self.player_index == 1 and current_hole == 7):
-                continue
-                
-            # Skip burned holes
-            if (current_hole in game.burned_holes[0] or 
-                current_hole in game.burned_holes[1]):
-                continue
-                
-            stones -= 1
+        current_hole = sowing_path(self.player_index, game.burned_mask).landing(hole, game.board[hole])
         
         # Check if we land in our own head
         return ((self.player_index == 0 and current_hole == 7) or
@@ -205,49 +165,171 @@ class BasicRuleBot:
     def get_move(self, game):
         return self.realistic_bot.get_move(game)
 
+def choose_heuristic_move(game, player_index, rng=random, cache=None):
+    """
+    Best heuristic move for player_index. The game is only read (no side-to-move
+    swapping, no per-move heuristic objects); rng feeds the Variation term and
+    cache is an optional EvaluationCache.
+    """
+    legal = game.legal_mask(player_index)
+    if not legal:
+        return None
+    
+    try:
+        # All legal holes scored in one pass, totals only (no per-term dicts)
+        moves, scores, _ = evaluate_all_moves(game.state, player_index, game.metrics['moves'], rng, cache=cache)
+    except Exception as e:
+        print(f"Heuristic evaluation failed: {e}")
+        return next(iter_holes(legal))
+    
+    # First best in ascending hole order, as max() over (move, score) pairs picked
+    return moves[scores.index(max(scores))]
+
 class HeuristicBot:
-    def __init__(self, player_index):
+    def __init__(self, player_index, cache=None, rng=None):
         self.player_index = player_index
+        self.cache = cache
+        self.rng = rng if rng is not None else random
     
     def get_move(self, game):
-        # Create fresh heuristic instance for current game state
-        # and temporarily set the current player to this bot's player index
-        original_player = game.current_player
-        game.current_player = self.player_index  # Set to this bot's perspective
-        
-        heuristic = SungkaHeuristic(game)  # Fresh instance with current game state
-        valid_moves = game.get_valid_moves(self.player_index)
-        
-        if not valid_moves:
-            game.current_player = original_player  # Restore original
-            return None
-        
-        # Get scored moves using the heuristic
-        scored = []
-        for move in valid_moves:
-            try:
-                score, _ = heuristic.evaluate_move_verbose(move)
-                scored.append((move, score))
-            except Exception as e:
-                print(f"Heuristic evaluation failed for move {move}: {e}")
-                scored.append((move, -1000))
-        
-        game.current_player = original_player  # Restore original
-        
-        if not scored:
-            return valid_moves[0] if valid_moves else None
-            
-        return max(scored, key=lambda x: x[1])[0]
+        return choose_heuristic_move(game, self.player_index, self.rng, self.cache)
+
+OPPONENT_NAMES = {
+    1: 'Random',
+    2: 'Realistic Basic Rules', 
+    3: 'Heuristic vs Heuristic',
+    4: 'Max Policy',
+    5: 'Exact Policy',
+    6: 'Alpha-Beta Search',
+    7: 'Monte Carlo Tree Search'
+}
+
+# Columns analyze_results reads back from the result file
+ANALYSIS_COLUMNS = ['random_stream', 'heuristic_goes_first', 'heuristic_won', 'score_difference', 'moves_played', 'total_moves',
+                    'marbles_captured_by_heuristic', 'extra_turns_by_heuristic',
+                    'burned_created_by_heuristic', 'burned_suffered_by_heuristic',
+                    'burned_holes_p0', 'burned_holes_p1']
+
+# Data rows an .xlsx sheet can hold (1,048,576 minus the header)
+EXCEL_MAX_ROWS = 1048575
+
+# 2: heuristic_goes_first=False hands the opponent the first move in every run mode
+CHECKPOINT_VERSION = 2
+CHECKPOINT_SUFFIX = '.checkpoint.json'
+
+# Simulator rebuilt once in each worker process of a parallel run
+_worker_simulator = None
+
+# SIGTERM during a run only records the exit code; the run exits at the next game
+# boundary (or after end_run), so a flush or checkpoint is never cut off half-way
+_exit_deferred = False
+_pending_exit = None
+
+
+def _exit_on_signal(signum, frame):
+    global _pending_exit
+    if _exit_deferred:
+        _pending_exit = 128 + signum
+    else:
+        sys.exit(128 + signum)
+
+
+def _defer_exit(deferred):
+    global _exit_deferred
+    _exit_deferred = deferred
+
+
+def _exit_if_requested():
+    if _pending_exit is not None:
+        sys.exit(_pending_exit)
+
+
+def _init_worker(config):
+    global _worker_simulator
+    # Workers do not write results: SIGTERM stops them straight away
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    _worker_simulator = Simulator(**config)
+
+
+def _play_game_job(job):
+    """Play one (game_number, heuristic_goes_first, detailed_log) job in a worker process"""
+    sim = _worker_simulator
+    sim.mcts_stats = MCTSStats()
+    sim.latency = LatencyRecorder()
+    cache = sim.eval_cache
+    before = (cache.hits, cache.misses, cache.evictions) if cache is not None else None
+    row = sim.simulate_single_game(*job)
+    cache_counts = None
+    if cache is not None:
+        cache_counts = (cache.hits - before[0], cache.misses - before[1], cache.evictions - before[2])
+    return row, sim.mcts_stats, cache_counts, sim.latency
+
+
+def find_latest_checkpoint(directory):
+    """Most recently written checkpoint of an unfinished run in directory, or None"""
+    candidates = []
+    for name in os.listdir(directory):
+        if not name.endswith(CHECKPOINT_SUFFIX):
+            continue
+        path = os.path.join(directory, name)
+        with open(path) as f:
+            if json.load(f).get('complete'):
+                continue
+        candidates.append(path)
+    return max(candidates, key=os.path.getmtime, default=None)
+
 
 class Simulator:
-    def __init__(self, opponent_type, num_simulations=100, max_moves_per_game=200, random_seed=None, save_excel=True, save_directory=None):
+    def __init__(self, opponent_type, num_simulations=100, max_moves_per_game=200, random_seed=None, save_excel=True, save_directory=None, event_sink=None, eval_cache_size=None, search_node_budget=5000, search_time_budget=None, mcts_simulations=1000, mcts_time_budget=None, workers=1, chunk_size=None, result_buffer_size=1000, checkpoint_every=100, telemetry_interval=10.0, telemetry=None, sprt_elo0=None, sprt_elo1=None, sprt_alpha=0.05, sprt_beta=0.05):
         self.opponent_type = opponent_type
         self.num_simulations = num_simulations
         self.max_moves_per_game = max_moves_per_game
         self.save_excel = save_excel
-        if random_seed is not None:
-            random.seed(random_seed)
-        self.per_game_rows = []
+        # Games run headless unless a sink is given (e.g. ConsoleEventSink() for debugging)
+        self.event_sink = event_sink
+        # Optional LRU cache of heuristic evaluations, shared by every heuristic player in the run
+        self.eval_cache = EvaluationCache(eval_cache_size) if eval_cache_size else None
+        # Per-decision budgets for the alpha-beta opponent (type 6)
+        self.search_node_budget = search_node_budget
+        self.search_time_budget = search_time_budget
+        # Per-decision budgets and throughput counters for the MCTS opponent (type 7)
+        self.mcts_simulations = mcts_simulations
+        self.mcts_time_budget = mcts_time_budget
+        self.mcts_stats = MCTSStats()
+        # Per-decision think time of every bot, by bot class and game phase
+        self.latency = LatencyRecorder()
+        # Every game draws from its own stream derived from (run seed, game number),
+        # so a game can be replayed alone and the run does not depend on game order
+        if random_seed is None:
+            random_seed = random.SystemRandom().randrange(2 ** 32)
+        self.random_seed = random_seed
+        # Per-game rows stream to a CSV file in save_directory (see open_results);
+        # at most result_buffer_size rows are held in memory
+        self.result_buffer_size = result_buffer_size
+        self.results = None
+        # A checkpoint (JSON next to the CSV) is rewritten every checkpoint_every games
+        # and when a run stops; from_checkpoint() + resume() finish an interrupted run
+        self.checkpoint_every = checkpoint_every
+        self.checkpoint_path = None
+        self.run_mode = None
+        self.detailed_logging = False
+        self.run_start = None
+        self.elapsed_before = 0.0
+        # Live games/s, moves/s and ETA every telemetry_interval seconds (console + JSONL
+        # next to the CSV); pass one RunTelemetry to several simulators for a per-opponent breakdown
+        self.telemetry = telemetry if telemetry is not None else RunTelemetry(telemetry_interval)
+        # With sprt_elo0 and sprt_elo1 set, run_standard stops as soon as the SPRT accepts
+        # "the heuristic is sprt_elo0 Elo stronger than the opponent" (H0) or sprt_elo1 (H1);
+        # run_paired tests whole pairs (PairSPRT), as its two games are not independent
+        self.sprt_elo0 = sprt_elo0
+        self.sprt_elo1 = sprt_elo1
+        self.sprt_alpha = sprt_alpha
+        self.sprt_beta = sprt_beta
+        self.sprt = self.new_sprt()
+        # Worker processes for run_standard / run_turn_order_analysis (0 = one per CPU).
+        # Workers run headless with their own evaluation cache.
+        self.workers = workers if workers else os.cpu_count() or 1
+        self.chunk_size = chunk_size
         
         # Set save directory
         if save_directory is None:
@@ -266,50 +348,259 @@ class Simulator:
             print("📂 Falling back to current directory")
             self.save_directory = "./"
 
-    def get_heuristic_move(self, game, player_index):
-        """Create fresh heuristic instance for each move evaluation"""
-        valid_moves = game.get_valid_moves(player_index)
-        if not valid_moves:
+    def config(self):
+        """Constructor arguments that rebuild this simulator (checkpoints, worker processes)"""
+        return {
+            'opponent_type': self.opponent_type,
+            'num_simulations': self.num_simulations,
+            'max_moves_per_game': self.max_moves_per_game,
+            'random_seed': self.random_seed,
+            'save_excel': self.save_excel,
+            'save_directory': self.save_directory,
+            'eval_cache_size': self.eval_cache.max_entries if self.eval_cache is not None else None,
+            'search_node_budget': self.search_node_budget,
+            'search_time_budget': self.search_time_budget,
+            'mcts_simulations': self.mcts_simulations,
+            'mcts_time_budget': self.mcts_time_budget,
+            'workers': self.workers,
+            'chunk_size': self.chunk_size,
+            'result_buffer_size': self.result_buffer_size,
+            'checkpoint_every': self.checkpoint_every,
+            'telemetry_interval': self.telemetry.interval,
+            'sprt_elo0': self.sprt_elo0,
+            'sprt_elo1': self.sprt_elo1,
+            'sprt_alpha': self.sprt_alpha,
+            'sprt_beta': self.sprt_beta,
+        }
+
+    def worker_config(self):
+        """Constructor arguments that rebuild this simulator in a worker process"""
+        config = self.config()
+        config.update(save_excel=False, workers=1)
+        return config
+
+    def open_results(self):
+        """Start a fresh CSV result file for a run"""
+        name = OPPONENT_NAMES.get(self.opponent_type, 'unknown').lower().replace(' ', '_')
+        path = os.path.join(self.save_directory, f"simulation_results_{name}_{int(time.time())}.csv")
+        self.results = CSVResultSink(path, self.result_buffer_size)
+        self.checkpoint_path = os.path.splitext(path)[0] + CHECKPOINT_SUFFIX
+        print(f"📊 Streaming results to: {path}")
+        return self.results
+
+    def begin_run(self, run_mode, enable_detailed_logging, resume):
+        """Open a fresh result file, or keep the one restored by from_checkpoint; returns the games to skip"""
+        if resume:
+            if self.results is None or self.run_mode != run_mode:
+                raise ValueError(f"No {run_mode} run to resume; load one with Simulator.from_checkpoint()")
+            print(f"⏩ Resuming {self.results.path} after {len(self.results)} completed games")
+        else:
+            self.run_mode = run_mode
+            self.detailed_logging = enable_detailed_logging
+            self.elapsed_before = 0.0
+            self.open_results()
+        _defer_exit(True)
+        self.run_start = time.time()
+        skip = len(self.results)
+        self.sprt = self.new_sprt()
+        if self.sprt is not None and skip:
+            # Replay the finished games' results into the test
+            for chunk in self.results.read_chunks(columns=['heuristic_won']):
+                for won in chunk['heuristic_won']:
+                    self.sprt.record(None if pd.isna(won) else bool(won))
+        self.telemetry.start_run(OPPONENT_NAMES.get(self.opponent_type, 'Unknown'), self.num_simulations, skip,
+                                 jsonl_path=os.path.splitext(self.results.path)[0] + '.telemetry.jsonl',
+                                 run_info={'run_seed': self.random_seed, 'opponent_type': self.opponent_type,
+                                           'run_mode': run_mode, 'workers': self.workers})
+        return skip
+
+    def end_run(self):
+        """Flush results, write the checkpoint and the final telemetry line (also on interrupt)"""
+        self.results.close()
+        self.save_checkpoint()
+        self.telemetry.end_run()
+        latency_rows = self.latency.rows()
+        if latency_rows:
+            pd.DataFrame(latency_rows).to_csv(os.path.splitext(self.results.path)[0] + '.latency.csv', index=False)
+        _defer_exit(False)
+        _exit_if_requested()
+
+    def elapsed(self):
+        """Run time so far, including the sessions before a resume"""
+        if self.run_start is None:
+            return self.elapsed_before
+        return self.elapsed_before + time.time() - self.run_start
+
+    def new_sprt(self):
+        if self.sprt_elo0 is None or self.sprt_elo1 is None:
             return None
-        
-        # Temporarily set the game's current player for proper heuristic evaluation
-        original_player = game.current_player
-        game.current_player = player_index
-        
-        # Create fresh heuristic instance with current game state
-        heuristic = SungkaHeuristic(game)
-        
-        scored = []
-        for move in valid_moves:
-            try:
-                score, _ = heuristic.evaluate_move_verbose(move)
-                scored.append((move, score))
-            except Exception as e:
-                print(f"Heuristic evaluation failed for move {move}: {e}")
-                scored.append((move, -1000))
-        
-        # Restore original current player
-        game.current_player = original_player
-        
-        if not scored:
-            return valid_moves[0] if valid_moves else None
-            
-        return max(scored, key=lambda x: x[1])[0]
+        test = PairSPRT if self.run_mode == 'paired' else SPRT
+        return test(self.sprt_elo0, self.sprt_elo1, self.sprt_alpha, self.sprt_beta)
+
+    def sprt_decision(self):
+        """SPRT verdict so far, or None (no test, or still undecided)"""
+        return self.sprt.decision() if self.sprt is not None else None
+
+    def heuristic_decisions(self, row):
+        """Moves chosen by the heuristic in a game (both sides in heuristic vs heuristic)"""
+        if self.opponent_type == 3:
+            return row['total_moves']
+        return row['moves_played']
+
+    def record(self, row):
+        """Append a finished game's row, checkpointing every checkpoint_every games"""
+        self.results.append(row)
+        self.telemetry.record_game(row['total_moves'], self.heuristic_decisions(row))
+        if self.sprt is not None:
+            self.sprt.record(row['heuristic_won'])
+        if self.checkpoint_every and len(self.results) % self.checkpoint_every == 0:
+            self.save_checkpoint()
+        # A SIGTERM received during the game stops the run here, between games
+        _exit_if_requested()
+
+    def save_checkpoint(self):
+        """
+        Flush the result file and atomically rewrite the checkpoint. Games are
+        written in order and each draws from game_rng(game_number), so the
+        completed count is all the RNG state a resume needs; the counters that
+        are not in the CSV (MCTS throughput, cache hits) are saved alongside.
+        """
+        self.results.flush()
+        cache = self.eval_cache
+        checkpoint = {
+            'version': CHECKPOINT_VERSION,
+            'config': self.config(),
+            'run_mode': self.run_mode,
+            'enable_detailed_logging': self.detailed_logging,
+            'results_path': self.results.path,
+            'games_completed': len(self.results),
+            'complete': len(self.results) >= self.num_simulations or self.sprt_decision() is not None,
+            'elapsed': self.elapsed(),
+            'mcts_stats': vars(self.mcts_stats),
+            'eval_cache': [cache.hits, cache.misses, cache.evictions] if cache is not None else None,
+            'latency': self.latency.to_dict(),
+        }
+        tmp_path = self.checkpoint_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(checkpoint, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.checkpoint_path)
+
+    @classmethod
+    def from_checkpoint(cls, checkpoint_path, workers=None):
+        """Rebuild the simulator, result file and counters of a checkpointed run; call resume() to finish it"""
+        with open(checkpoint_path) as f:
+            checkpoint = json.load(f)
+        if checkpoint.get('version') != CHECKPOINT_VERSION:
+            raise ValueError(f"Unsupported checkpoint version: {checkpoint.get('version')}")
+        config = checkpoint['config']
+        if workers is not None:
+            config['workers'] = workers
+        sim = cls(**config)
+        sim.run_mode = checkpoint['run_mode']
+        sim.detailed_logging = checkpoint['enable_detailed_logging']
+        sim.elapsed_before = checkpoint['elapsed']
+        sim.checkpoint_path = checkpoint_path
+        # Rows flushed after the checkpoint was written are dropped and replayed
+        sim.results = CSVResultSink(checkpoint['results_path'], sim.result_buffer_size,
+                                    resume_rows=checkpoint['games_completed'])
+        for name, value in checkpoint['mcts_stats'].items():
+            setattr(sim.mcts_stats, name, value)
+        if sim.eval_cache is not None and checkpoint['eval_cache']:
+            sim.eval_cache.merge_counts(*checkpoint['eval_cache'])
+        sim.latency = LatencyRecorder.from_dict(checkpoint['latency'])
+        return sim
+
+    def resume(self):
+        """Finish the run restored by from_checkpoint without replaying completed games"""
+        if self.run_mode == 'turn_order':
+            return self.run_turn_order_analysis(self.detailed_logging, resume=True)
+        if self.run_mode == 'paired':
+            return self.run_paired(self.detailed_logging, resume=True)
+        return self.run_standard(self.detailed_logging, resume=True)
+
+    def play_games(self, jobs):
+        """
+        Play (game_number, heuristic_goes_first, detailed_log) jobs, append
+        each row to self.results and yield it, in job order, as soon as it
+        and every earlier game are done.
+        With workers > 1 the jobs are spread over a process pool in chunks;
+        every game draws from game_rng(game_number), so the rows are the same
+        as in a serial run.
+        """
+        jobs = list(jobs)
+        if self.results is None:
+            self.open_results()
+        if self.workers <= 1 or len(jobs) <= 1:
+            for job in jobs:
+                row = self.simulate_single_game(*job)
+                self.record(row)
+                yield row
+            return
+
+        workers = min(self.workers, len(jobs))
+        # Small chunks keep in-order streaming smooth; large ones cut IPC overhead
+        chunk_size = self.chunk_size or max(1, min(64, len(jobs) // (workers * 4)))
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                       initargs=(self.worker_config(),))
+        try:
+            for row, mcts_stats, cache_counts, latency in executor.map(_play_game_job, jobs, chunksize=chunk_size):
+                self.mcts_stats.merge(mcts_stats)
+                self.latency.merge(latency)
+                if cache_counts is not None and self.eval_cache is not None:
+                    self.eval_cache.merge_counts(*cache_counts)
+                self.record(row)
+                yield row
+        finally:
+            # Drop queued chunks if the run stops early (interrupt, SIGTERM)
+            executor.shutdown(cancel_futures=True)
+
+    def game_rng(self, game_number):
+        """Independent random.Random for one game (string seeds hash the same in every process)"""
+        return random.Random(f"sungka:{self.random_seed}:{game_number}")
+
+    def get_heuristic_move(self, game, player_index, rng=random):
+        """Score every legal move with the stateless evaluator"""
+        return choose_heuristic_move(game, player_index, rng, self.eval_cache)
 
-    def get_opponent_bot(self, player_index):
+    def get_opponent_bot(self, player_index, rng=None):
         if self.opponent_type == 1:
-            return RandomBot(player_index)
+            return RandomBot(player_index, rng)
         elif self.opponent_type == 2:
             return BasicRuleBot(player_index)
         elif self.opponent_type == 3:
-            return HeuristicBot(player_index)
+            return HeuristicBot(player_index, cache=self.eval_cache, rng=rng)
         elif self.opponent_type == 4:
             return MaxPolicyBot(player_index)
         elif self.opponent_type == 5:
             return ExactPolicyBot(player_index)
+        elif self.opponent_type == 6:
+            return AlphaBetaBot(player_index, node_budget=self.search_node_budget, time_budget=self.search_time_budget,
+                                evaluate_all_moves=evaluate_all_moves, cache=self.eval_cache)
+        elif self.opponent_type == 7:
+            # A fresh bot per game; it reuses its own tree between moves within the game
+            return MCTSBot(player_index, self.mcts_simulations, self.mcts_time_budget,
+                           rng=rng if rng is not None else random.Random(), stats=self.mcts_stats)
 
-    def simulate_single_game(self, game_number, heuristic_goes_first=True, enable_detailed_logging=False):
-        game = SungkaGame()
+    def simulate_single_game(self, game_number, heuristic_goes_first=True, enable_detailed_logging=False, stream=None):
+        """
+        Play one game. All randomness comes from self.game_rng(game_number), so
+        calling this again with the same arguments replays the game exactly.
+        heuristic_goes_first=False seats the heuristic as Player 2 and gives the
+        opponent the first move; None flips the turn order with that stream
+        (run_standard). With stream set (run_paired), the heuristic and the
+        opponent each draw from their own stream derived from it instead, so a
+        seat-swapped replay hands each side the same random numbers.
+        """
+        if stream is None:
+            rng = heuristic_rng = opponent_rng = self.game_rng(game_number)
+            if heuristic_goes_first is None:
+                heuristic_goes_first = rng.choice([True, False])
+        else:
+            heuristic_rng = self.game_rng(f"{stream}:heuristic")
+            opponent_rng = self.game_rng(f"{stream}:opponent")
+        game = SungkaGame(event_sink=self.event_sink)
         
         # Initialize logger for detailed logging if enabled
         logger = None
@@ -322,12 +613,14 @@ class Simulator:
             heuristic_player = 0
             opponent_player = 1
         else:
-            game.current_player = 1  # Opponent is Player 1 (goes first), Heuristic is Player 2
+            game.current_player = 0  # Opponent is Player 1 (goes first), Heuristic is Player 2
             heuristic_player = 1
             opponent_player = 0
 
         # Create opponent bot (for heuristic vs heuristic, both use HeuristicBot)
-        opponent = self.get_opponent_bot(opponent_player)
+        opponent = self.get_opponent_bot(opponent_player, opponent_rng)
+        opponent_name = type(opponent).__name__
+        latency = self.latency
         move_count = 0
 
         # Track heuristic-specific metrics
@@ -346,22 +639,24 @@ class Simulator:
             current_player = game.current_player
             
             # Check if current player has valid moves
-            valid_moves = game.get_valid_moves(current_player)
-            if not valid_moves:
+            if not game.legal_mask(current_player):
                 game.collect_remaining_stones()
                 break
 
-            # Store board state before move
-            board_before = game.board.copy()
-            score_before = (game.board[7], game.board[15])
-            burned_before = {0: set(game.burned_holes[0]), 1: set(game.burned_holes[1])}
+            # The move result reports captures and burns; the board copy is only for the logger
+            board_before = game.board.copy() if logger else None
 
+            # Time each decision on its own (think time only, not the move itself)
+            started = time.perf_counter_ns()
             if current_player == heuristic_player:
                 # Heuristic player's turn
-                move = self.get_heuristic_move(game, heuristic_player)
+                move = self.get_heuristic_move(game, heuristic_player, heuristic_rng)
+                bot_name = 'HeuristicBot'
             else:
                 # Opponent bot
                 move = opponent.get_move(game)
+                bot_name = opponent_name
+            latency.record(bot_name, game_phase(game.board), time.perf_counter_ns() - started)
 
             if move is None:
                 game.collect_remaining_stones()
@@ -371,58 +666,38 @@ class Simulator:
                 result = game.play_turn(move)
                 move_count += 1
                 
-                # Calculate what happened in this move
-                score_after = (game.board[7], game.board[15])
-                burned_after = game.burned_holes
+                # What happened in this move (head gain includes an end-of-game sweep)
+                stones_captured = result.head_gain
+                new_burns = result.burned_mask
                 
                 # Track metrics ONLY for the heuristic player
                 if current_player == heuristic_player:
-                    # Calculate stones captured by heuristic player
-                    if heuristic_player == 0:
-                        stones_captured = score_after[0] - score_before[0]
-                    else:
-                        stones_captured = score_after[1] - score_before[1]
-                    
                     heuristic_metrics["marbles_captured"] += max(0, stones_captured)
-                    heuristic_metrics["extra_turns"] += 1 if (result == "Extra Turn") else 0
+                    heuristic_metrics["extra_turns"] += 1 if result.extra_turn else 0
                     heuristic_metrics["moves"] += 1
                     
                     # Track burned holes created BY heuristic player
-                    burned_created = len(burned_after[heuristic_player] - burned_before[heuristic_player])
+                    burned_created = (new_burns & SIDE_MASKS[heuristic_player]).bit_count()
                     heuristic_metrics["burned_created"] += burned_created
                     
                     # Track burned holes created AGAINST heuristic player (by opponent)
-                    burned_suffered = len(burned_after[opponent_player] - burned_before[opponent_player])
+                    burned_suffered = (new_burns & SIDE_MASKS[opponent_player]).bit_count()
                     heuristic_metrics["burned_suffered"] += burned_suffered
                 
-                extra_turn = (result == "Extra Turn")
-                
-                # Find new burned holes for logging
-                burned_holes_created = []
-                for player_idx in [0, 1]:
-                    new_burns = burned_after[player_idx] - burned_before[player_idx]
-                    burned_holes_created.extend(list(new_burns))
-                
                 # Log detailed move if logger is enabled
                 if logger:
-                    stones_captured_this_move = 0
-                    if current_player == 0:
-                        stones_captured_this_move = score_after[0] - score_before[0]
-                    else:
-                        stones_captured_this_move = score_after[1] - score_before[1]
-                    
-                    logger.record_move(game, result, move)
+                    logger.record_move(game, result.status, move)
                     logger.record_detailed_move(
                         game=game,
                         hole_selected=move,
                         board_before=board_before,
-                        action_result=result,
-                        stones_captured=stones_captured_this_move,
-                        extra_turn=extra_turn,
-                        burned_holes_created=burned_holes_created
+                        action_result=result.status,
+                        stones_captured=stones_captured,
+                        extra_turn=result.extra_turn,
+                        burned_holes_created=result.burned_holes
                     )
                 
-                if result == "Game Over":
+                if result.game_over:
                     break
                     
             except ValueError as e:
@@ -453,6 +728,7 @@ class Simulator:
         # Record game results using heuristic-specific metrics
         row = {
             'game_number': game_number,
+            'random_stream': game_number if stream is None else stream,
             'heuristic_goes_first': heuristic_goes_first,
             'heuristic_player_index': heuristic_player,
             'winner': winner,
@@ -464,6 +740,7 @@ class Simulator:
             'score_difference': score_difference,
             'abs_score_difference': abs_score_difference,
             'moves_played': heuristic_metrics['moves'],
+            'total_moves': move_count,
             'marbles_captured_by_heuristic': heuristic_metrics['marbles_captured'],
             'extra_turns_by_heuristic': heuristic_metrics['extra_turns'],
             'burned_created_by_heuristic': heuristic_metrics['burned_created'],
@@ -472,120 +749,240 @@ class Simulator:
             'burned_holes_p1': ','.join(map(str, sorted(list(game.burned_holes[1])))) if game.burned_holes[1] else ''
         }
 
-        self.per_game_rows.append(row)
         return row
 
-    def run_turn_order_analysis(self, enable_detailed_logging=False):
-        """Run simulations testing both turn orders"""
-        start = time.time()
-        
+    def run_turn_order_analysis(self, enable_detailed_logging=False, resume=False):
+        """Run simulations testing both turn orders (resume=True continues a run from from_checkpoint)"""
+        if self.sprt is not None:
+            # Seats are played in two blocks, so stopping part way would skew the result
+            raise ValueError("SPRT early stopping needs run_standard (random turn order for every game)")
         # Split simulations between first/second player scenarios
         first_player_games = self.num_simulations // 2
         second_player_games = self.num_simulations - first_player_games
         
-        print(f"Running {first_player_games} games as first player...")
-        for i in range(1, first_player_games + 1):
-            if i % 10 == 0:
-                print(f"  First player games: {i}/{first_player_games}")
-            # Only log detailed moves for first few games to avoid too many files
-            detailed_log = enable_detailed_logging and i <= 5
-            self.simulate_single_game(i, heuristic_goes_first=True, enable_detailed_logging=detailed_log)
-        
-        print(f"Running {second_player_games} games as second player...")
-        for i in range(first_player_games + 1, self.num_simulations + 1):
-            if (i - first_player_games) % 10 == 0:
-                print(f"  Second player games: {i - first_player_games}/{second_player_games}")
-            # Only log detailed moves for first few games to avoid too many files
-            detailed_log = enable_detailed_logging and (i - first_player_games) <= 5
-            self.simulate_single_game(i, heuristic_goes_first=False, enable_detailed_logging=detailed_log)
-
-        elapsed = time.time() - start
-        df = pd.DataFrame(self.per_game_rows)
-        
-        self.analyze_results(df, elapsed)
-        return df
-
-    def run_standard(self, enable_detailed_logging=False):
-        """Run standard simulation with random turn order"""
-        start = time.time()
-
-        for i in range(1, self.num_simulations + 1):
-            if i % 10 == 0:
-                print(f"Completed {i}/{self.num_simulations} simulations...")
-            # Randomly choose who goes first
-            heuristic_first = random.choice([True, False])
-            # Only log detailed moves for first few games to avoid too many files
-            detailed_log = enable_detailed_logging and i <= 5
-            self.simulate_single_game(i, heuristic_goes_first=heuristic_first, enable_detailed_logging=detailed_log)
-
-        elapsed = time.time() - start
-        df = pd.DataFrame(self.per_game_rows)
-        
-        self.analyze_results(df, elapsed)
-        return df
-
-    def analyze_results(self, df, elapsed):
-        """Analyze and print simulation results"""
-        total = len(df)
+        # Only log detailed moves for first few games of each order to avoid too many files
+        jobs = [(i, True, enable_detailed_logging and i <= 5) for i in range(1, first_player_games + 1)]
+        jobs += [(i, False, enable_detailed_logging and i - first_player_games <= 5)
+                 for i in range(first_player_games + 1, self.num_simulations + 1)]
+        
+        skip = self.begin_run('turn_order', enable_detailed_logging, resume)
+        if skip < first_player_games:
+            print(f"Running {first_player_games} games as first player...")
+        second_started = skip > first_player_games
+        try:
+            for row in self.play_games(jobs[skip:]):
+                i = row['game_number']
+                if i <= first_player_games:
+                    if i % 10 == 0:
+                        print(f"  First player games: {i}/{first_player_games}")
+                    continue
+                if not second_started:
+                    print(f"Running {second_player_games} games as second player...")
+                    second_started = True
+                if (i - first_player_games) % 10 == 0:
+                    print(f"  Second player games: {i - first_player_games}/{second_player_games}")
+        finally:
+            # Keep every finished game on disk even if the run is interrupted
+            self.end_run()
+
+        self.analyze_results(self.results, self.elapsed())
+        return self.results
+
+    def run_standard(self, enable_detailed_logging=False, resume=False):
+        """Run standard simulation with random turn order (resume=True continues a run from from_checkpoint)"""
+        # Who goes first is drawn from the game's own random stream;
+        # only log detailed moves for first few games to avoid too many files
+        jobs = [(i, None, enable_detailed_logging and i <= 5) for i in range(1, self.num_simulations + 1)]
+        skip = self.begin_run('standard', enable_detailed_logging, resume)
+        # Rows come back in game order, so the SPRT stops at the same game in serial and parallel runs
+        games = self.play_games([] if self.sprt_decision() else jobs[skip:])
+        try:
+            for row in games:
+                i = row['game_number']
+                if i % 10 == 0:
+                    print(f"Completed {i}/{self.num_simulations} simulations...")
+                if self.sprt_decision():
+                    print(f"🛑 SPRT {self.sprt.decision()} after {i} games; stopping early")
+                    break
+        finally:
+            games.close()
+            # Keep every finished game on disk even if the run is interrupted
+            self.end_run()
+
+        self.analyze_results(self.results, self.elapsed())
+        return self.results
+
+    def run_paired(self, enable_detailed_logging=False, resume=False):
+        """
+        Run seat-swapped pairs: pair k plays game 2k-1 with the heuristic first and
+        game 2k with it second, from the same random streams, so the first-move
+        advantage and most of the luck cancel within a pair. analyze_results then
+        adds statistics on the pairs (resume=True continues a run from from_checkpoint).
+        """
+        pairs = (self.num_simulations + 1) // 2
+        if self.num_simulations != 2 * pairs:
+            print(f"⚠️ Paired runs play whole pairs: running {2 * pairs} games")
+            self.num_simulations = 2 * pairs
+        
+        # Only log detailed moves for first few games to avoid too many files
+        jobs = []
+        for pair in range(1, pairs + 1):
+            for game_number, heuristic_goes_first in ((2 * pair - 1, True), (2 * pair, False)):
+                jobs.append((game_number, heuristic_goes_first, enable_detailed_logging and game_number <= 5, pair))
+        
+        skip = self.begin_run('paired', enable_detailed_logging, resume)
+        games = self.play_games([] if self.sprt_decision() else jobs[skip:])
+        try:
+            for row in games:
+                i = row['game_number']
+                if i % 20 == 0:
+                    print(f"Completed {i // 2}/{pairs} pairs...")
+                # PairSPRT only moves on whole pairs
+                if i % 2 == 0 and self.sprt_decision():
+                    print(f"🛑 SPRT {self.sprt.decision()} after {i // 2} pairs; stopping early")
+                    break
+        finally:
+            games.close()
+            # Keep every finished game on disk even if the run is interrupted
+            self.end_run()
+
+        self.analyze_results(self.results, self.elapsed())
+        return self.results
+
+    def analyze_pairs(self, results, game_std, games):
+        """Print statistics on the seat-swapped pairs of a paired run (both games of a pair combined)"""
+        chunks = (results.read_chunks(columns=['random_stream', 'heuristic_won', 'score_difference'])
+                  if isinstance(results, CSVResultSink) else [results])
+        
+        # 1. Combine each pair as soon as both games have been read
+        pending = {}
+        pairs = 0
+        diff_sum = diff_sq = 0.0
+        score_sum = score_sq = 0.0
+        pentanomial = Counter()
+        for df in chunks:
+            for stream, won, diff in zip(df['random_stream'], df['heuristic_won'], df['score_difference']):
+                points = 0.5 if pd.isna(won) else float(bool(won))
+                other = pending.pop(stream, None)
+                if other is None:
+                    pending[stream] = (points, diff)
+                    continue
+                pair_points = points + other[0]
+                pair_diff = (diff + other[1]) / 2
+                pairs += 1
+                pentanomial[pair_points] += 1
+                diff_sum += pair_diff
+                diff_sq += pair_diff ** 2
+                score_sum += pair_points / 2
+                score_sq += (pair_points / 2) ** 2
+
+        print("\n--- PAIRED ANALYSIS (seat-swapped pairs) ---")
+        print(f"Pairs: {pairs}" + (f"  ({len(pending)} unpaired games ignored)" if pending else ""))
+        if pairs < 2:
+            return
+        print("Heuristic Points per Pair: " +
+              "  ".join(f"{points:g}: {pentanomial[points]}" for points in (0, 0.5, 1, 1.5, 2)))
+        
+        # 2. Standard errors from the spread of the pair means
+        mean_diff = diff_sum / pairs
+        se_diff = math.sqrt(max(0.0, (diff_sq - pairs * mean_diff ** 2) / (pairs - 1)) / pairs)
+        score = score_sum / pairs
+        se_score = math.sqrt(max(0.0, (score_sq - pairs * score ** 2) / (pairs - 1)) / pairs)
+        print(f"Score per Game: {score*100:.1f}%  Elo: {elo_from_score(score):+.1f} "
+              f"(95% CI {elo_from_score(score - 1.96 * se_score):+.1f} to {elo_from_score(score + 1.96 * se_score):+.1f})")
+        print(f"Mean Score Difference per Game: {mean_diff:+.2f} ± {1.96 * se_diff:.2f} (95% CI)")
+        
+        # 3. Against what the same number of independent games would give
+        se_independent = game_std / math.sqrt(games)
+        if se_diff > 0:
+            reduction = (se_independent / se_diff) ** 2
+            print(f"Standard Error: {se_diff:.3f} paired vs {se_independent:.3f} as independent games "
+                  f"(variance reduced {reduction:.2f}x)")
+        else:
+            print(f"Standard Error: 0 paired vs {se_independent:.3f} as independent games")
+
+    def analyze_results(self, results, elapsed):
+        """
+        Analyze and print simulation results. results is a CSVResultSink (read
+        chunk by chunk, so memory does not grow with the run) or a DataFrame.
+        """
+        chunks = results.read_chunks(columns=ANALYSIS_COLUMNS) if isinstance(results, CSVResultSink) else [results]
+
+        # 1. Accumulate counts and sums in one pass; score differences are small
+        #    integers, so a histogram gives the exact median and spread
+        total = 0
+        heuristic_wins = opponent_wins = 0
+        score_counts = Counter()
+        # Turn order -> [games, heuristic wins, score difference sum]
+        by_order = {True: [0, 0, 0], False: [0, 0, 0]}
+        total_moves = total_captured = total_extra = total_burn_created = total_burn_suffered = 0
+        all_moves = 0
+        games_with_burns = 0
+        for df in chunks:
+            total += len(df)
+            won = df['heuristic_won']
+            heuristic_wins += won.eq(True).sum()
+            opponent_wins += won.eq(False).sum()
+            score_counts.update(df['score_difference'].tolist())
+            for goes_first, group in df.groupby('heuristic_goes_first'):
+                order = by_order[bool(goes_first)]
+                order[0] += len(group)
+                order[1] += group['heuristic_won'].eq(True).sum()
+                order[2] += group['score_difference'].sum()
+            total_moves += df['moves_played'].sum()
+            all_moves += df['total_moves'].sum()
+            total_captured += df['marbles_captured_by_heuristic'].sum()
+            total_extra += df['extra_turns_by_heuristic'].sum()
+            total_burn_created += df['burned_created_by_heuristic'].sum()
+            total_burn_suffered += df['burned_suffered_by_heuristic'].sum()
+            games_with_burns += ((df['burned_holes_p0'] != '') | (df['burned_holes_p1'] != '')).sum()
         
         if total == 0:
             print("No games completed successfully.")
             return
 
         # Overall statistics
-        heuristic_wins = df['heuristic_won'].eq(True).sum()
-        opponent_wins = df['heuristic_won'].eq(False).sum()
-        draws = df['heuristic_won'].isna().sum()
+        draws = total - heuristic_wins - opponent_wins
 
         # Score difference statistics
-        avg_score_diff = df['score_difference'].mean()
-        avg_abs_score_diff = df['abs_score_difference'].mean()
-        median_score_diff = df['score_difference'].median()
-        std_score_diff = df['score_difference'].std()
-        max_score_diff = df['score_difference'].max()
-        min_score_diff = df['score_difference'].min()
+        scores = sorted(score_counts)
+        avg_score_diff = sum(s * n for s, n in score_counts.items()) / total
+        avg_abs_score_diff = sum(abs(s) * n for s, n in score_counts.items()) / total
+        median_score_diff = (self.score_at(scores, score_counts, (total - 1) // 2) +
+                             self.score_at(scores, score_counts, total // 2)) / 2
+        if total > 1:
+            std_score_diff = math.sqrt(sum(n * (s - avg_score_diff) ** 2 for s, n in score_counts.items()) / (total - 1))
+        else:
+            std_score_diff = float('nan')
+        max_score_diff = scores[-1]
+        min_score_diff = scores[0]
 
         # Turn order analysis
-        first_player_df = df[df['heuristic_goes_first'] == True]
-        second_player_df = df[df['heuristic_goes_first'] == False]
-        
-        first_wins = first_player_df['heuristic_won'].eq(True).sum() if len(first_player_df) > 0 else 0
-        first_total = len(first_player_df)
-        second_wins = second_player_df['heuristic_won'].eq(True).sum() if len(second_player_df) > 0 else 0
-        second_total = len(second_player_df)
+        first_total, first_wins, first_score_sum = by_order[True]
+        second_total, second_wins, second_score_sum = by_order[False]
         
         # Score difference by turn order
-        first_avg_score_diff = first_player_df['score_difference'].mean() if len(first_player_df) > 0 else 0
-        second_avg_score_diff = second_player_df['score_difference'].mean() if len(second_player_df) > 0 else 0
+        first_avg_score_diff = first_score_sum / first_total if first_total > 0 else 0
+        second_avg_score_diff = second_score_sum / second_total if second_total > 0 else 0
 
         # Performance metrics
-        total_moves = df['moves_played'].sum()
         if total_moves > 0:
-            avg_capture = df['marbles_captured_by_heuristic'].sum() / total_moves
-            avg_extra = df['extra_turns_by_heuristic'].sum() / total_moves
-            avg_burn_created = df['burned_created_by_heuristic'].sum() / total_moves
-            avg_burn_suffered = df['burned_suffered_by_heuristic'].sum() / total_moves
+            avg_capture = total_captured / total_moves
+            avg_extra = total_extra / total_moves
+            avg_burn_created = total_burn_created / total_moves
+            avg_burn_suffered = total_burn_suffered / total_moves
         else:
             avg_capture = avg_extra = avg_burn_created = avg_burn_suffered = 0
 
-        # Count games with burned holes
-        games_with_burns = len(df[(df['burned_holes_p0'] != '') | 
-                                 (df['burned_holes_p1'] != '')])
-
         # Print results
-        opponent_names = {
-            1: 'Random',
-            2: 'Realistic Basic Rules', 
-            3: 'Heuristic vs Heuristic',
-            4: 'Max Policy',
-            5: 'Exact Policy'
-        }
+        opponent_names = OPPONENT_NAMES
         
         print("\n" + "="*60)
         print("HEURISTIC PERFORMANCE ANALYSIS")
         print("="*60)
         print(f"Opponent Type: {self.opponent_type} ({opponent_names.get(self.opponent_type, 'Unknown')})")
         print(f"Total Games: {total}")
+        print(f"Run Seed: {self.random_seed}")
         print(f"Total Time: {elapsed:.2f} seconds")
         print(f"Average Game Length: {total_moves/total:.1f} moves" if total > 0 else "N/A")
         
@@ -625,23 +1022,108 @@ class Simulator:
         print(f"Avg Burned Holes Suffered per Move: {avg_burn_suffered:.6f}")
         print(f"Games with Burned Holes: {games_with_burns}/{total} ({games_with_burns/total*100:.1f}%)")
         
+        if self.eval_cache is not None:
+            stats = self.eval_cache.stats()
+            print("\n--- EVALUATION CACHE ---")
+            print(f"Hits: {stats['hits']}  Misses: {stats['misses']}  Hit Rate: {stats['hit_rate']*100:.1f}%")
+            if self.workers > 1:
+                print(f"Entries: held per worker ({self.workers} workers)  Evictions: {stats['evictions']}")
+            else:
+                print(f"Entries: {stats['entries']}/{stats['max_entries']}  Evictions: {stats['evictions']}")
+        
+        if self.run_mode == 'paired':
+            self.analyze_pairs(results, std_score_diff, total)
+        
+        if self.sprt is not None:
+            print("\n--- SPRT ---")
+            print(self.sprt.report())
+            print(f"Games Played: {total}/{self.num_simulations}  Games Saved: {self.num_simulations - total} "
+                  f"({(self.num_simulations - total)/self.num_simulations*100:.1f}%)")
+        
+        if elapsed > 0:
+            heuristic_decisions = all_moves if self.opponent_type == 3 else total_moves
+            print("\n--- THROUGHPUT ---")
+            print(f"Games/s: {total/elapsed:.2f}  Moves/s: {all_moves/elapsed:,.0f}  "
+                  f"Heuristic Decisions/s: {heuristic_decisions/elapsed:,.0f}")
+        
+        latency_rows = self.latency.rows()
+        if latency_rows:
+            print("\n--- DECISION LATENCY (ms) ---")
+            print(f"{'Bot':<22} {'Phase':<11} {'Decisions':>9} {'p50':>8} {'p95':>8} {'p99':>8} {'Max':>8}")
+            for row in latency_rows:
+                print(f"{row['bot']:<22} {row['phase']:<11} {row['decisions']:>9} {row['p50_ms']:>8.3f} "
+                      f"{row['p95_ms']:>8.3f} {row['p99_ms']:>8.3f} {row['max_ms']:>8.3f}")
+        
+        if self.opponent_type == 7:
+            print("\n--- MCTS THROUGHPUT ---")
+            print(self.mcts_stats.report())
+        
         print("="*60)
 
         if self.save_excel:
-            timestamp = int(time.time())
-            outname = f"simulation_results_{opponent_names.get(self.opponent_type, 'unknown').lower().replace(' ', '_')}_{timestamp}.xlsx"
-            outpath = os.path.join(self.save_directory, outname)
-            
+            self.export_excel(results, total)
+
+    @staticmethod
+    def score_at(scores, score_counts, index):
+        """Score difference at position index of the sorted games"""
+        for score in scores:
+            index -= score_counts[score]
+            if index < 0:
+                return score
+
+    def export_excel(self, results, total):
+        """Optional copy of the per-game rows as .xlsx (the CSV result file is the primary store)"""
+        if total > EXCEL_MAX_ROWS:
+            print(f"⚠️ {total} games exceed Excel's {EXCEL_MAX_ROWS} row limit; skipping the .xlsx export")
+            return
+        df = results.read() if isinstance(results, CSVResultSink) else results
+        latency_df = pd.DataFrame(self.latency.rows())
+        timestamp = int(time.time())
+        outname = f"simulation_results_{OPPONENT_NAMES.get(self.opponent_type, 'unknown').lower().replace(' ', '_')}_{timestamp}.xlsx"
+        outpath = os.path.join(self.save_directory, outname)
+
+        def write_workbook(path):
+            with pd.ExcelWriter(path) as writer:
+                df.to_excel(writer, sheet_name='Games', index=False)
+                if not latency_df.empty:
+                    latency_df.to_excel(writer, sheet_name='Decision_Latency', index=False)
+        
+        try:
+            write_workbook(outpath)
+            print(f"Saved detailed results to: {outpath}")
+        except Exception as e:
+            print(f"Error saving simulation results: {e}")
+            # Fallback to current directory
             try:
-                df.to_excel(outpath, index=False)
-                print(f"Saved detailed results to: {outpath}")
-            except Exception as e:
-                print(f"Error saving simulation results: {e}")
-                # Fallback to current directory
-                df.to_excel(outname, index=False)
+                write_workbook(outname)
                 print(f"Saved to fallback location: {outname}")
+            except Exception as e:
+                print(f"Excel export failed; results remain in {results.path if isinstance(results, CSVResultSink) else 'memory'}: {e}")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sungka heuristic simulation (interactive unless --resume is given)")
+    parser.add_argument("--resume", nargs="?", const=".", metavar="CHECKPOINT",
+                        help="finish an interrupted run from a checkpoint file, or from the newest "
+                             "unfinished checkpoint in a directory (default: current directory)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes for the resumed run (0 = one per CPU)")
+    args = parser.parse_args()
+
+    # Preemptible machines send SIGTERM: finish the current game, then exit through the
+    # normal cleanup so the result file is flushed and the checkpoint is written
+    signal.signal(signal.SIGTERM, _exit_on_signal)
+
+    if args.resume:
+        checkpoint_path = args.resume
+        if os.path.isdir(checkpoint_path):
+            checkpoint_path = find_latest_checkpoint(checkpoint_path)
+            if checkpoint_path is None:
+                sys.exit(f"No unfinished checkpoint found in {args.resume}")
+        print(f"⏩ Resuming from checkpoint: {checkpoint_path}")
+        sim = Simulator.from_checkpoint(checkpoint_path, workers=args.workers)
+        sim.resume()
+        print("\n🎉 Simulation complete!")
+        sys.exit(0)
+
     print("🎮 ENHANCED SUNGKA SIMULATION")
     print("Choose opponent:")
     print("1 = Random Bot")
@@ -649,26 +1131,29 @@ if __name__ == "__main__":
     print("3 = Heuristic vs Heuristic")
     print("4 = Max Policy Bot (always picks house with most stones)")
     print("5 = Exact Policy Bot (picks house where stones = distance to head)")
+    print("6 = Alpha-Beta Search Bot (iterative deepening over the heuristic)")
+    print("7 = Monte Carlo Tree Search Bot (UCT with policy rollouts)")
     
     while True:
         try:
-            choice = int(input("Enter choice (1-5): "))
-            if choice in [1, 2, 3, 4, 5]:
+            choice = int(input("Enter choice (1-7): "))
+            if choice in [1, 2, 3, 4, 5, 6, 7]:
                 break
-            print("Please enter 1, 2, 3, 4, or 5.")
+            print("Please enter a number from 1 to 7.")
         except ValueError:
             print("Please enter a number.")
     
     print("\nChoose simulation type:")
     print("1 = Standard (random turn order)")
     print("2 = Turn Order Analysis (test first/second player scenarios)")
+    print("3 = Paired (every seed played twice with seats swapped)")
     
     while True:
         try:
-            sim_type = int(input("Enter choice (1-2): "))
-            if sim_type in [1, 2]:
+            sim_type = int(input("Enter choice (1-3): "))
+            if sim_type in [1, 2, 3]:
                 break
-            print("Please enter 1 or 2.")
+            print("Please enter 1, 2 or 3.")
         except ValueError:
             print("Please enter a number.")
     
@@ -682,10 +1167,23 @@ if __name__ == "__main__":
         except ValueError:
             print("Please enter a number.")
     
+    # Ask about worker processes
+    while True:
+        try:
+            workers = int(input("Worker processes (default 1, 0 = one per CPU): ") or "1")
+            if workers >= 0:
+                break
+            print("Please enter 0 or a positive number.")
+        except ValueError:
+            print("Please enter a number.")
+    
     # Ask about detailed logging
     print("\nEnable detailed move logging for first 5 games? (Creates individual Excel files)")
     enable_logging = input("Enable detailed logging? (y/n, default n): ").lower().strip() == 'y'
     
+    # Results always stream to a CSV file; the .xlsx copy is optional
+    save_excel = input("Also export results to Excel (.xlsx)? (y/n, default y): ").lower().strip() != 'n'
+    
     # Ask about save directory
     print(f"\nCurrent save directory: {os.getcwd()}")
     print("💡 Tip: Use forward slashes (/) or double backslashes (\\\\) in paths")
@@ -704,14 +1202,33 @@ if __name__ == "__main__":
                 custom_dir = suggestion
         save_dir = custom_dir
     
+    # SPRT early stopping (random turn order or paired runs); num_sims becomes the game cap
+    sprt_elo0 = sprt_elo1 = None
+    if sim_type in [1, 3] and input("\nStop early with an SPRT on Elo? (y/n, default n): ").lower().strip() == 'y':
+        while True:
+            try:
+                sprt_elo0 = float(input("H0 Elo of heuristic over opponent (default 0): ") or "0")
+                sprt_elo1 = float(input("H1 Elo of heuristic over opponent (default 20): ") or "20")
+                if sprt_elo1 > sprt_elo0:
+                    break
+                print("H1 Elo must be greater than H0 Elo.")
+            except ValueError:
+                print("Please enter a number.")
+    
     # Create simulator
-    sim = Simulator(opponent_type=choice, num_simulations=num_sims, save_directory=save_dir)
+    sim = Simulator(opponent_type=choice, num_simulations=num_sims, save_directory=save_dir, workers=workers, save_excel=save_excel,
+                    sprt_elo0=sprt_elo0, sprt_elo1=sprt_elo1)
     
     if sim_type == 1:
         print(f"\n🚀 Running {num_sims} games with random turn order...")
         if enable_logging:
             print("📝 Detailed logging enabled for first 5 games")
         sim.run_standard(enable_detailed_logging=enable_logging)
+    elif sim_type == 3:
+        print(f"\n🚀 Running {num_sims} games as seat-swapped pairs...")
+        if enable_logging:
+            print("📝 Detailed logging enabled for first 5 games")
+        sim.run_paired(enable_detailed_logging=enable_logging)
     else:
         print(f"\n🚀 Running turn order analysis with {num_sims} games...")
         if enable_logging:
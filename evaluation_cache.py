@@ -0,0 +1,75 @@
+# evaluation_cache.py
+"""
+Bounded LRU cache for heuristic move evaluations.
+
+Entries are keyed by (Zobrist position hash, hole, evaluating player) and hold
+only the part of a score fixed by the position and hole: the heuristics store
+the running total before the random 'Variation' term, the game progress that
+decides whether Variation applies, and any terms that come after it. The
+Variation draw and the move-count based 'Turn Balance' term are recomputed on
+every lookup, so a cached evaluation returns exactly what a fresh one would
+(and consumes the same random numbers).
+
+One cache can be shared by every HeuristicBot in a run, but only with a single
+heuristic module (entries from different heuristics are not interchangeable).
+It is not locked: share it between bots in one thread, not across threads.
+Worker processes of a parallel run each keep their own cache; merge_counts()
+folds their hit/miss/eviction counters back into the parent's.
+"""
+from collections import OrderedDict
+
+
+class EvaluationCache:
+    def __init__(self, max_entries=200000):
+        if max_entries <= 0:
+            raise ValueError(f"max_entries must be positive, got {max_entries}")
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        """Cached entry for key (marked most recently used) or None"""
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key, entry):
+        entries = self.entries
+        entries[key] = entry
+        entries.move_to_end(key)
+        if len(entries) > self.max_entries:
+            entries.popitem(last=False)
+            self.evictions += 1
+
+    def merge_counts(self, hits, misses, evictions):
+        self.hits += hits
+        self.misses += misses
+        self.evictions += evictions
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self):
+        return {
+            'entries': len(self.entries),
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hit_rate,
+        }
@@ -0,0 +1,81 @@
+# game_events.py
+"""
+Event sinks for SungkaGame.
+
+The engine never prints on its own: it reports what happened (sowing legs,
+relays, captures, Sunog, end-of-game collection, game over) to an event sink.
+NullEventSink (the default) drops everything so simulations run headless;
+ConsoleEventSink reproduces the classic console output for interactive play.
+"""
+
+
+class GameEventSink:
+    """Base sink: every hook is a no-op, override the ones you need"""
+    # When True the engine skips building event payloads entirely
+    silent = False
+
+    def load(self, game):
+        pass
+
+    def sow(self, game, last_hole):
+        """One sowing leg finished with its last stone in last_hole"""
+        pass
+
+    def relay(self, game, hole):
+        """Sowing continues from hole (last stone landed in an occupied pit)"""
+        pass
+
+    def capture(self, game, player, last_hole, opposite_hole, stones):
+        pass
+
+    def sunog(self, game, player, hole, seeds):
+        pass
+
+    def collect(self, game, player1_stones, player2_stones, collector):
+        """End-of-game sweep; collector is None when nothing was collected"""
+        pass
+
+    def game_over(self, game):
+        pass
+
+
+class NullEventSink(GameEventSink):
+    """Headless mode: drops every event"""
+    silent = True
+
+
+class ConsoleEventSink(GameEventSink):
+    """Prints engine events to the terminal (the original SungkaGame output)"""
+
+    def load(self, game):
+        print("✅ Load Complete")
+
+    def sow(self, game, last_hole):
+        print("\n--- Intermediate Board State ---")
+        print(f"Last stone landed in hole {last_hole}")
+        game.print_board_state()
+
+    def relay(self, game, hole):
+        print(f"Continuing distribution from hole {hole}...")
+
+    def capture(self, game, player, last_hole, opposite_hole, stones):
+        print(f"Player {player + 1} captured {stones} stones from holes {last_hole} and {opposite_hole}")
+        print(f"🔥 SUNOG! Player {player + 1}'s hole {last_hole} is now burned.")
+
+    def sunog(self, game, player, hole, seeds):
+        print(f"🔥 SUNOG! Player {player + 1}'s hole {hole} burned. {seeds} seed(s) moved to Player {player + 1}'s head.")
+
+    def collect(self, game, player1_stones, player2_stones, collector):
+        if collector == 1:
+            print(f"Player 1's side is empty. Player 2 collects {player2_stones} remaining stones.")
+        elif collector == 0:
+            print(f"Player 2's side is empty. Player 1 collects {player1_stones} remaining stones.")
+        elif player1_stones == 0 and player2_stones == 0:
+            # Both sides empty (shouldn't normally happen, but just in case)
+            print("Both sides are empty. No stones to collect.")
+        else:
+            # This shouldn't happen in normal game flow, but handle it
+            print(f"Warning: collect_remaining_stones called but both sides have stones (P1: {player1_stones}, P2: {player2_stones})")
+
+    def game_over(self, game):
+        game.print_metrics_summary()
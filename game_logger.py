@@ -13,6 +13,7 @@ class GameLogger:
             'Player 1 Score': [],
             'Player 2 Score': [],
             'Board State': [],
+            'Position Record': [],
             'Best Move': [],
             'Best Score': []
         }
@@ -72,6 +73,7 @@ class GameLogger:
         self.session_data['Player 1 Score'].append(game.board[7])
         self.session_data['Player 2 Score'].append(game.board[15])
         self.session_data['Board State'].append(str(game.board))
+        self.session_data['Position Record'].append(game.to_bytes().hex())
         self.session_data['Best Move'].append(best_move)
         self.session_data['Best Score'].append(best_score)
     
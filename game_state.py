@@ -0,0 +1,488 @@
+# game_state.py
+"""
+Compact Sungka position used by the engine, the bots and the heuristics.
+
+Board layout (same as SungkaGame):
+    0-6   Player 1 holes      7  Player 1 head
+    8-14  Player 2 holes     15  Player 2 head
+
+Burned holes for both players are kept in ONE 16-bit mask (bit i set means
+hole i is burned). Player 1 can only burn holes 0-6 and Player 2 only holes
+8-14, so the owner of a burned hole is implied by its position.
+
+Positions carry a 64-bit Zobrist hash: the XOR of one key per (pit, stone
+count) for all 16 pits (heads included), one key per burned hole and a key
+for Player 2 to move. It is updated incrementally as stones move; see
+hash_collision_check.py for the collision test.
+
+SungkaState.to_bytes() packs a position into a fixed 16-byte record, one
+byte per pit:
+    - a burned hole is stored as BURNED_BYTE (burned holes are always empty),
+    - the top bit of byte 15 (Player 2's head) is the side to move.
+There are 98 stones in play, so pits never reach 0xFF and heads never reach
+0x80. Pickling a state goes through the same record.
+"""
+import random
+
+HEADS = (7, 15)
+SIDE_MASKS = (0x007F, 0x7F00)  # holes 0-6 / holes 8-14
+SIDE_BITS = SIDE_MASKS[0] | SIDE_MASKS[1]
+INITIAL_BOARD = [7] * 7 + [0] + [7] * 7 + [0]
+
+# Zobrist keys (fixed seed so hashes agree across processes and runs)
+MAX_PIT_STONES = 255
+_zobrist_rng = random.Random(0x53554E474B41)
+PIT_KEYS = tuple(tuple(_zobrist_rng.getrandbits(64) for _ in range(MAX_PIT_STONES + 1)) for _ in range(16))
+# STEP_KEYS[pit][n] turns the key for n stones into the key for n + 1
+STEP_KEYS = tuple(tuple(keys[n] ^ keys[n + 1] for n in range(MAX_PIT_STONES)) for keys in PIT_KEYS)
+BURNED_KEYS = tuple(_zobrist_rng.getrandbits(64) for _ in range(16))
+SIDE_KEY = _zobrist_rng.getrandbits(64)
+del _zobrist_rng
+
+# 16-byte position record (see module docstring)
+RECORD_SIZE = 16
+BURNED_BYTE = 0xFF
+SIDE_TO_MOVE_BIT = 0x80
+
+# Capture / Sunog markers stored in undo records
+NO_TERMINAL = 0
+CAPTURE = 1
+SUNOG = 2
+
+
+def mask_to_holes(mask):
+    """List of hole indices whose bit is set in mask (ascending)"""
+    holes = []
+    while mask:
+        low = mask & -mask
+        holes.append(low.bit_length() - 1)
+        mask ^= low
+    return holes
+
+
+def iter_holes(mask):
+    """Yield the hole indices whose bit is set in mask (ascending, no list built)"""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def holes_to_mask(holes):
+    mask = 0
+    for hole in holes:
+        mask |= 1 << hole
+    return mask
+
+
+def compute_hash(board, burned_mask, current_player):
+    """Full Zobrist hash of a position (the incremental updates must match this)"""
+    h = SIDE_KEY if current_player == 1 else 0
+    for pit in range(16):
+        h ^= PIT_KEYS[pit][board[pit]]
+    for hole in mask_to_holes(burned_mask):
+        h ^= BURNED_KEYS[hole]
+    return h
+
+
+class SowingPath:
+    """
+    Precomputed sowing order for one (player, burned mask) combination.
+
+    active      pits that receive stones, in sowing order starting from hole 0
+    ring        active repeated twice so a leg can be sliced without wrapping
+    first_index index into active/ring of the first pit sown after each hole
+    position    index of each pit in active (-1 for skipped pits)
+
+    side_prefix[p][k] counts player p's pits in ring[:k] and ring_bits[k] is the
+    bitmask of the side pits in ring[:k] (XOR-accumulated), so the stones a leg
+    adds to each side and the pits it fills are O(1) differences.
+    """
+    __slots__ = ("active", "ring", "cycle_length", "position", "first_index", "next_pit",
+                 "side_prefix", "ring_bits", "side_counts", "active_side_mask")
+
+    def __init__(self, player, burned_mask):
+        # Holes that never receive stones: opponent's head and every burned hole
+        skip = burned_mask | (1 << HEADS[1 - player])
+        self.active = tuple(i for i in range(16) if not skip >> i & 1)
+        self.cycle_length = len(self.active)
+        self.ring = self.active * 2
+        position = [-1] * 16
+        for index, pit in enumerate(self.active):
+            position[pit] = index
+        self.position = tuple(position)
+        next_pit = []
+        for hole in range(16):
+            pit = (hole + 1) & 15
+            while skip >> pit & 1:
+                pit = (pit + 1) & 15
+            next_pit.append(pit)
+        self.next_pit = tuple(next_pit)
+        self.first_index = tuple(position[pit] for pit in next_pit)
+
+        side_prefix = ([0], [0])
+        ring_bits = [0]
+        for pit in self.ring:
+            for side in (0, 1):
+                side_prefix[side].append(side_prefix[side][-1] + (SIDE_MASKS[side] >> pit & 1))
+            ring_bits.append(ring_bits[-1] ^ ((1 << pit) & SIDE_BITS))
+        self.side_prefix = (tuple(side_prefix[0]), tuple(side_prefix[1]))
+        self.ring_bits = tuple(ring_bits)
+        self.side_counts = (side_prefix[0][self.cycle_length], side_prefix[1][self.cycle_length])
+        self.active_side_mask = ring_bits[self.cycle_length]
+
+    def landing(self, hole, stones):
+        """Pit that receives the last of stones sown from hole (no relay)"""
+        if stones == 0:
+            return hole
+        return self.active[(self.first_index[hole] + stones - 1) % self.cycle_length]
+
+    def steps_to(self, hole, target):
+        """Stones needed from hole for the last one to land exactly in target"""
+        return (self.position[target] - self.first_index[hole]) % self.cycle_length + 1
+
+
+_SOWING_PATHS = {}
+
+
+def sowing_path(player, burned_mask):
+    """Cached SowingPath; burned-mask combinations are few and repeat constantly"""
+    key = burned_mask << 1 | player
+    path = _SOWING_PATHS.get(key)
+    if path is None:
+        path = _SOWING_PATHS[key] = SowingPath(player, burned_mask)
+    return path
+
+
+def sow(board, start_hole, player, burned_mask, legs=None, on_leg=None, counts=None):
+    """
+    Iterative sowing kernel shared by the engine and the heuristics.
+
+    Picks up start_hole and sows for player, skipping the opponent's head and
+    every burned hole, then keeps relaying from the landing hole while the
+    last stone lands in an occupied pit. Mutates board in place.
+
+    legs, if given, receives one (start_hole, stones) pair per leg.
+    on_leg, if given, is called as on_leg(last_hole, relaying) after each leg.
+    counts, if given, is a [player1_stones, player2_stones, occupied_mask] list
+    kept up to date as stones move (see SungkaState.counts); a fourth entry,
+    if present, is a Zobrist hash that is updated as well.
+    Returns (last_hole, relay_count).
+    """
+    head = HEADS[player]
+    path = sowing_path(player, burned_mask)
+    ring = path.ring
+    first_index = path.first_index
+    cycle_length = path.cycle_length
+    hashed = counts is not None and len(counts) > 3
+    current_hole = start_hole
+    relays = 0
+    while True:
+        stones = board[current_hole]
+        board[current_hole] = 0
+        if legs is not None:
+            legs.append((current_hole, stones))
+        if counts is not None:
+            # Legs always start from a side pit, never from a head
+            counts[0 if current_hole < 7 else 1] -= stones
+            counts[2] &= ~(1 << current_hole)
+            if hashed:
+                counts[3] ^= PIT_KEYS[current_hole][stones] ^ PIT_KEYS[current_hole][0]
+        if stones >= cycle_length:
+            # Every full lap drops one stone in each active pit (the start pit included)
+            # and ends back on the start pit, so only the remainder needs sowing
+            laps, stones = divmod(stones, cycle_length)
+            if hashed:
+                h = counts[3]
+                for pit in path.active:
+                    n = board[pit]
+                    board[pit] = n + laps
+                    h ^= PIT_KEYS[pit][n] ^ PIT_KEYS[pit][n + laps]
+                counts[3] = h
+            else:
+                for pit in path.active:
+                    board[pit] += laps
+            if counts is not None:
+                counts[0] += laps * path.side_counts[0]
+                counts[1] += laps * path.side_counts[1]
+                counts[2] |= path.active_side_mask
+        if stones:
+            first = first_index[current_hole]
+            last = first + stones
+            if hashed:
+                h = counts[3]
+                for pit in ring[first:last]:
+                    n = board[pit]
+                    board[pit] = n + 1
+                    h ^= STEP_KEYS[pit][n]
+                counts[3] = h
+            else:
+                for pit in ring[first:last]:
+                    board[pit] += 1
+            current_hole = ring[last - 1]
+            if counts is not None:
+                side_prefix = path.side_prefix
+                counts[0] += side_prefix[0][last] - side_prefix[0][first]
+                counts[1] += side_prefix[1][last] - side_prefix[1][first]
+                counts[2] |= path.ring_bits[last] ^ path.ring_bits[first]
+
+        relaying = current_hole != head and board[current_hole] > 1
+        if on_leg is not None:
+            on_leg(current_hole, relaying)
+        if not relaying:
+            return current_hole, relays
+        relays += 1
+
+
+def unsow(board, start_hole, stones, player, burned_mask):
+    """Exact inverse of one sowing leg of stones picked up from start_hole"""
+    path = sowing_path(player, burned_mask)
+    laps, remaining = divmod(stones, path.cycle_length)
+    if laps:
+        for pit in path.active:
+            board[pit] -= laps
+    if remaining:
+        first = path.first_index[start_hole]
+        for pit in path.ring[first:first + remaining]:
+            board[pit] -= 1
+    board[start_hole] = stones
+
+
+def take_stones(board, counts, hole):
+    """Empty side pit hole and return its stones, updating a sow()-style counts list"""
+    seeds = board[hole]
+    if seeds:
+        board[hole] = 0
+        counts[0 if hole < 7 else 1] -= seeds
+        counts[2] &= ~(1 << hole)
+        if len(counts) > 3:
+            counts[3] ^= PIT_KEYS[hole][seeds] ^ PIT_KEYS[hole][0]
+    return seeds
+
+
+def add_stones(board, counts, pit, stones):
+    """Add stones to any pit (usually a head), updating a sow()-style counts list"""
+    if not stones:
+        return
+    n = board[pit]
+    board[pit] = n + stones
+    if pit not in HEADS:
+        counts[0 if pit < 7 else 1] += stones
+        counts[2] |= 1 << pit
+    if len(counts) > 3:
+        counts[3] ^= PIT_KEYS[pit][n] ^ PIT_KEYS[pit][n + stones]
+
+
+class SungkaState:
+    """
+    Slotted game state with make_move/unmake_move so search never copies.
+
+    counts is [player1_stones, player2_stones, occupied_mask, zobrist_hash]: the
+    stones left in holes 0-6 and 8-14, a bitmask of the side pits that hold
+    stones and the position hash. It is updated incrementally as stones move,
+    so side totals, active-hole counts and the hash are O(1). Code that writes
+    to board, burned_mask or current_player directly must call recount()
+    afterwards (or use take_stones/add_stones/burn/set_current_player).
+    """
+    __slots__ = ("board", "burned_mask", "current_player", "counts")
+
+    def __init__(self, board=None, burned_mask=0, current_player=0):
+        self.board = list(INITIAL_BOARD) if board is None else list(board)
+        self.burned_mask = burned_mask
+        self.current_player = current_player
+        self.recount()
+
+    def __reduce__(self):
+        return (SungkaState.from_bytes, (self.to_bytes(),))
+
+    def to_bytes(self):
+        """Pack the position into the 16-byte record described in the module docstring"""
+        record = bytearray(self.board)
+        for hole in iter_holes(self.burned_mask):
+            record[hole] = BURNED_BYTE
+        record[15] |= self.current_player << 7
+        return bytes(record)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Rebuild a state from to_bytes() output"""
+        if len(data) != RECORD_SIZE:
+            raise ValueError(f"Expected a {RECORD_SIZE}-byte position record, got {len(data)} bytes")
+        board = list(data)
+        current_player = board[15] >> 7
+        board[15] &= SIDE_TO_MOVE_BIT - 1
+        burned_mask = 0
+        for hole in range(15):
+            if board[hole] == BURNED_BYTE:
+                burned_mask |= 1 << hole
+                board[hole] = 0
+        return cls(board, burned_mask, current_player)
+
+    def recount(self):
+        board = self.board
+        occupied = 0
+        for i in range(16):
+            if board[i] > 0:
+                occupied |= 1 << i
+        self.counts = [sum(board[0:7]), sum(board[8:15]), occupied & SIDE_BITS,
+                       compute_hash(board, self.burned_mask, self.current_player)]
+
+    def copy(self):
+        clone = SungkaState.__new__(SungkaState)
+        clone.board = self.board.copy()
+        clone.burned_mask = self.burned_mask
+        clone.current_player = self.current_player
+        clone.counts = self.counts.copy()
+        return clone
+
+    @property
+    def side_totals(self):
+        """(stones in holes 0-6, stones in holes 8-14)"""
+        return self.counts[0], self.counts[1]
+
+    @property
+    def occupied_mask(self):
+        """Bitmask of side pits (0-6, 8-14) that hold at least one stone"""
+        return self.counts[2]
+
+    @property
+    def zobrist_hash(self):
+        """64-bit position hash: pit counts, heads, burned holes and side to move"""
+        return self.counts[3]
+
+    @property
+    def active_holes(self):
+        """(non-empty holes on Player 1's side, non-empty holes on Player 2's side)"""
+        occupied = self.counts[2]
+        return (occupied & SIDE_MASKS[0]).bit_count(), (occupied & SIDE_MASKS[1]).bit_count()
+
+    def burned_holes_of(self, player):
+        return set(mask_to_holes(self.burned_mask & SIDE_MASKS[player]))
+
+    def legal_mask(self, player=None):
+        """
+        Bitmask of the holes player may sow from: occupied, on their side, not burned.
+        Derived from the incrementally kept occupied mask, so it is two ANDs and
+        stays current across make_move/unmake_move without rescanning the board.
+        """
+        if player is None:
+            player = self.current_player
+        return self.counts[2] & SIDE_MASKS[player] & ~self.burned_mask
+
+    def is_valid_move(self, hole, player=None):
+        return 0 <= hole < 16 and self.legal_mask(player) >> hole & 1 == 1
+
+    def get_valid_moves(self, player=None):
+        return mask_to_holes(self.legal_mask(player))
+
+    def side_stones(self, player):
+        return self.counts[player]
+
+    def is_game_over(self):
+        return self.counts[self.current_player] == 0
+
+    def take_stones(self, hole):
+        """Empty side pit hole and return its stones, keeping counts in sync"""
+        return take_stones(self.board, self.counts, hole)
+
+    def add_stones(self, pit, stones):
+        add_stones(self.board, self.counts, pit, stones)
+
+    def burn(self, hole):
+        if not self.burned_mask >> hole & 1:
+            self.burned_mask |= 1 << hole
+            self.counts[3] ^= BURNED_KEYS[hole]
+
+    def set_current_player(self, player):
+        if player != self.current_player:
+            self.current_player = player
+            self.counts[3] ^= SIDE_KEY
+
+    def collect_remaining_stones(self):
+        """
+        Sweep the non-empty side into its owner's head once the other side is empty.
+        Returns (collecting_player, stones) or None when nothing was collected.
+        """
+        player1_stones, player2_stones = self.counts[0], self.counts[1]
+        if player1_stones == 0 and player2_stones > 0:
+            self.board[15] += player2_stones
+            for i in range(8, 15):
+                self.board[i] = 0
+            self.recount()
+            return 1, player2_stones
+        if player2_stones == 0 and player1_stones > 0:
+            self.board[7] += player1_stones
+            for i in range(0, 7):
+                self.board[i] = 0
+            self.recount()
+            return 0, player1_stones
+        return None
+
+    def get_winner(self):
+        if self.board[7] > self.board[15]:
+            return 0
+        elif self.board[15] > self.board[7]:
+            return 1
+        return None
+
+    def final_margin(self, player, collect=True):
+        """
+        Head margin for player once the game ends here. With collect, each side's
+        remaining stones go to its owner (the end-of-game sweep); a simulated game
+        skips the sweep when an extra turn emptied the mover's own side.
+        """
+        board = self.board
+        margin = board[HEADS[player]] - board[HEADS[1 - player]]
+        if collect:
+            margin += self.counts[player] - self.counts[1 - player]
+        return margin
+
+    def make_move(self, hole):
+        """
+        Play hole for the side to move, in place, with relay, capture and Sunog.
+
+        Returns an undo record for unmake_move. The side to move only changes
+        when the last stone did not land in the mover's own head.
+        """
+        board = self.board
+        player = self.current_player
+        mask = self.burned_mask
+        head = HEADS[player]
+
+        counts = self.counts
+        saved_counts = tuple(counts)
+        legs = []
+        current_hole, _ = sow(board, hole, player, mask, legs, counts=counts)
+
+        extra_turn = current_hole == head
+        terminal = (NO_TERMINAL,)
+        if not extra_turn and (SIDE_MASKS[player] >> current_hole & 1):
+            # Last stone in own (previously empty) hole: capture or Sunog, both burn it
+            opposite_hole = 14 - current_hole
+            seeds = self.take_stones(current_hole)
+            opposite_seeds = self.take_stones(opposite_hole)
+            self.add_stones(head, seeds + opposite_seeds)
+            self.burn(current_hole)
+            terminal = (CAPTURE if opposite_seeds > 0 else SUNOG, current_hole, seeds, opposite_hole, opposite_seeds)
+
+        if not extra_turn:
+            self.set_current_player(1 - player)
+
+        return (legs, terminal, mask, player, saved_counts)
+
+    def unmake_move(self, undo):
+        """Restore the position from before the make_move that returned undo"""
+        legs, terminal, mask, player, saved_counts = undo
+        board = self.board
+        if terminal[0] != NO_TERMINAL:
+            _, last_hole, seeds, opposite_hole, opposite_seeds = terminal
+            board[HEADS[player]] -= seeds + opposite_seeds
+            board[last_hole] = seeds
+            board[opposite_hole] = opposite_seeds
+
+        for start_hole, stones in reversed(legs):
+            unsow(board, start_hole, stones, player, mask)
+
+        self.burned_mask = mask
+        self.current_player = player
+        self.counts[:] = saved_counts
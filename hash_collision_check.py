@@ -0,0 +1,104 @@
+# hash_collision_check.py
+"""
+Collision test harness for the Zobrist position hash in game_state.py.
+
+Plays random games on SungkaState (random legal moves, random side to start),
+and at every position:
+  1. checks that the incrementally updated hash equals compute_hash() on the
+     same position (catches missed updates in sowing / capture / Sunog),
+  2. checks that unmake_move restores the previous hash exactly,
+  3. records hash -> position and counts distinct positions sharing a hash.
+
+Collisions are reported for the full 64-bit hash and for the hash truncated
+to --bits low bits (what a table indexed by hash & mask would see), next to
+the birthday-bound expectation n*(n-1)/2 / 2**bits. With a sound key table
+the 64-bit count should be 0 and the truncated count close to the expected one.
+
+Usage:
+    python hash_collision_check.py --games 20000 --seed 1 --bits 24
+"""
+import argparse
+import random
+import time
+
+from game_state import SungkaState, compute_hash
+
+
+def position_key(state):
+    return (tuple(state.board), state.burned_mask, state.current_player)
+
+
+def run_collision_test(num_games=20000, seed=1, bits=24, max_moves=200):
+    rng = random.Random(seed)
+    seen = {}
+    truncated = {}
+    low_mask = (1 << bits) - 1
+    collisions = 0
+    truncated_collisions = 0
+    positions = 0
+
+    def record(state):
+        nonlocal collisions, truncated_collisions, positions
+        h = state.zobrist_hash
+        expected = compute_hash(state.board, state.burned_mask, state.current_player)
+        if h != expected:
+            raise AssertionError(f"Incremental hash drifted: {h:#018x} != {expected:#018x} for {position_key(state)}")
+        key = position_key(state)
+        previous = seen.get(h)
+        if previous is None:
+            seen[h] = key
+            positions += 1
+            low = h & low_mask
+            if low in truncated:
+                truncated_collisions += 1
+            else:
+                truncated[low] = h
+        elif previous != key:
+            collisions += 1
+            print(f"64-bit collision {h:#018x}: {previous} vs {key}")
+
+    start = time.time()
+    for _ in range(num_games):
+        state = SungkaState(current_player=rng.randrange(2))
+        record(state)
+        for _ in range(max_moves):
+            moves = state.get_valid_moves()
+            if not moves:
+                break
+            move = rng.choice(moves)
+            before = state.zobrist_hash
+            undo = state.make_move(move)
+            if rng.random() < 0.1:
+                state.unmake_move(undo)
+                if state.zobrist_hash != before:
+                    raise AssertionError(f"unmake_move did not restore hash for move {move}")
+                undo = state.make_move(move)
+            record(state)
+        if state.collect_remaining_stones() is not None:
+            record(state)
+    elapsed = time.time() - start
+
+    expected_truncated = positions * (positions - 1) / 2 / 2 ** bits
+    return {
+        'games': num_games,
+        'distinct_positions': positions,
+        'collisions_64': collisions,
+        'collisions_truncated': truncated_collisions,
+        'expected_truncated': expected_truncated,
+        'bits': bits,
+        'elapsed': elapsed,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Zobrist hash collision test for Sungka positions")
+    parser.add_argument("--games", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--bits", type=int, default=24, help="also test the hash truncated to this many low bits")
+    args = parser.parse_args()
+
+    report = run_collision_test(args.games, args.seed, args.bits)
+    print(f"Games: {report['games']}  Distinct positions: {report['distinct_positions']}  ({report['elapsed']:.1f}s)")
+    print(f"64-bit collisions: {report['collisions_64']}")
+    print(f"{report['bits']}-bit collisions: {report['collisions_truncated']} "
+          f"(birthday-bound expectation {report['expected_truncated']:.1f})")
@@ -73,8 +73,7 @@ class ExactPolicyBot:
                 continue
                 
             # Skip burned holes
-            if (current_hole in game.burned_holes[0] or 
-                current_hole in game.burned_holes[1]):
+            if game.burned_mask >> current_hole & 1:
                 continue
             
             distance += 1
@@ -158,8 +157,7 @@ class RealisticBasicRuleBot:
                 continue
                 
             # Skip burned holes
-            if (current_hole in game.burned_holes[0] or 
-                current_hole in game.burned_holes[1]):
+            if game.burned_mask >> current_hole & 1:
                 continue
                 
             stones -= 1
@@ -187,8 +185,7 @@ class RealisticBasicRuleBot:
                 continue
                 
             # Skip burned holes
-            if (current_hole in game.burned_holes[0] or 
-                current_hole in game.burned_holes[1]):
+            if game.burned_mask >> current_hole & 1:
                 continue
                 
             stones -= 1
@@ -373,7 +370,7 @@ def simulate_single_game(self, game_number, heuristic_goes_first=True, enable_de
             break
 
         try:
-            result = game.play_turn(move)
+            result = game.play_turn(move).status
             move_count += 1
             
             # Calculate what happened in this move
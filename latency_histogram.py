@@ -0,0 +1,162 @@
+# latency_histogram.py
+"""
+HDR-style latency histograms for per-decision bot timing.
+
+LatencyHistogram stores nanosecond values in log-linear buckets: values
+below 2**SIGNIFICANT_BITS get one bucket each, larger values keep their top
+SIGNIFICANT_BITS bits, so every bucket is within 1/2**(SIGNIFICANT_BITS-1)
+(< 1%) of the values in it whatever the magnitude. Buckets are a sparse
+dict, recording is one bit_length() and a dict update, and histograms merge
+by adding counts (worker processes, resumed runs). Percentiles report the
+highest value of the bucket, so tail figures are never understated.
+
+LatencyRecorder keeps one histogram per (bot class, game phase).
+"""
+
+SIGNIFICANT_BITS = 8
+_LINEAR_LIMIT = 1 << SIGNIFICANT_BITS
+_HALF = 1 << (SIGNIFICANT_BITS - 1)
+
+PERCENTILES = (50, 95, 99)
+
+# Game phase by the share of the 98 stones already in the heads
+PHASES = ('opening', 'middlegame', 'endgame')
+
+
+def game_phase(board):
+    progress = (board[7] + board[15]) / 98
+    if progress < 1 / 3:
+        return 'opening'
+    if progress < 2 / 3:
+        return 'middlegame'
+    return 'endgame'
+
+
+def bucket_index(value):
+    if value < _LINEAR_LIMIT:
+        return value
+    shift = value.bit_length() - SIGNIFICANT_BITS
+    return _LINEAR_LIMIT + (shift - 1) * _HALF + (value >> shift) - _HALF
+
+
+def bucket_high(index):
+    """Highest value that falls in bucket index"""
+    if index < _LINEAR_LIMIT:
+        return index
+    shift, offset = divmod(index - _LINEAR_LIMIT, _HALF)
+    shift += 1
+    return ((offset + _HALF + 1) << shift) - 1
+
+
+class LatencyHistogram:
+    __slots__ = ("counts", "count", "total", "min", "max")
+
+    def __init__(self):
+        self.counts = {}
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+
+    def record(self, value):
+        index = bucket_index(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other):
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        self.max = max(self.max, other.max)
+
+    def percentile(self, percent):
+        """Value at percent (0-100), as the highest value of its bucket"""
+        if self.count == 0:
+            return 0
+        rank = max(1, -(-self.count * percent // 100))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(bucket_high(index), self.max)
+        return self.max
+
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def to_dict(self):
+        return {'counts': {str(index): count for index, count in self.counts.items()},
+                'count': self.count, 'total': self.total, 'min': self.min, 'max': self.max}
+
+    @classmethod
+    def from_dict(cls, data):
+        histogram = cls()
+        histogram.counts = {int(index): count for index, count in data['counts'].items()}
+        histogram.count = data['count']
+        histogram.total = data['total']
+        histogram.min = data['min']
+        histogram.max = data['max']
+        return histogram
+
+
+class LatencyRecorder:
+    """Per-decision latency histograms keyed by (bot class name, game phase)"""
+    def __init__(self):
+        self.histograms = {}
+
+    def record(self, bot, phase, nanoseconds):
+        histogram = self.histograms.get((bot, phase))
+        if histogram is None:
+            histogram = self.histograms[(bot, phase)] = LatencyHistogram()
+        histogram.record(nanoseconds)
+
+    def merge(self, other):
+        for key, histogram in other.histograms.items():
+            if key in self.histograms:
+                self.histograms[key].merge(histogram)
+            else:
+                self.histograms[key] = histogram
+
+    def bots(self):
+        return sorted({bot for bot, _ in self.histograms})
+
+    def combined(self, bot):
+        """One histogram over every phase of bot"""
+        histogram = LatencyHistogram()
+        for (name, _), phase_histogram in self.histograms.items():
+            if name == bot:
+                histogram.merge(phase_histogram)
+        return histogram
+
+    def rows(self):
+        """Summary rows (milliseconds) per bot and phase, plus an 'all' row per bot"""
+        rows = []
+        for bot in self.bots():
+            keyed = [(phase, self.histograms[(bot, phase)]) for phase in PHASES if (bot, phase) in self.histograms]
+            for phase, histogram in keyed + [('all', self.combined(bot))]:
+                row = {'bot': bot, 'phase': phase, 'decisions': histogram.count,
+                       'mean_ms': histogram.mean() / 1e6}
+                for percent in PERCENTILES:
+                    row[f'p{percent}_ms'] = histogram.percentile(percent) / 1e6
+                row['max_ms'] = histogram.max / 1e6
+                rows.append(row)
+        return rows
+
+    def to_dict(self):
+        return [{'bot': bot, 'phase': phase, 'histogram': histogram.to_dict()}
+                for (bot, phase), histogram in self.histograms.items()]
+
+    @classmethod
+    def from_dict(cls, data):
+        recorder = cls()
+        for entry in data:
+            recorder.histograms[(entry['bot'], entry['phase'])] = LatencyHistogram.from_dict(entry['histogram'])
+        return recorder
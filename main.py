@@ -1,12 +1,67 @@
 from heuristic import SungkaHeuristic
 from game_logger import GameLogger
+from game_state import SungkaState, HEADS, SIDE_MASKS, mask_to_holes, sow
+from game_events import NullEventSink, ConsoleEventSink
+
+# play_turn statuses
+EXTRA_TURN = "Extra Turn"
+TURN_COMPLETE = "Turn Complete"
+GAME_OVER = "Game Over"
+
+
+class MoveResult:
+    """
+    What one play_turn did, filled in while the move is played (no before/after diffing).
+    str(result) is the status string play_turn used to return.
+    """
+    __slots__ = ("status", "player", "hole", "last_hole", "relay_count", "stones_captured",
+                 "extra_turn", "burned_mask", "collector", "collected", "game_over")
+
+    def __init__(self, status, player, hole, last_hole=None, relay_count=0, stones_captured=0,
+                 extra_turn=False, burned_mask=0, collector=None, collected=0):
+        self.status = status
+        self.player = player
+        self.hole = hole
+        self.last_hole = last_hole
+        self.relay_count = relay_count
+        # Stones the mover put in their own head this move (sowing + capture/Sunog)
+        self.stones_captured = stones_captured
+        self.extra_turn = extra_turn
+        # Holes burned by this move
+        self.burned_mask = burned_mask
+        # End-of-game sweep: which player collected how many stones (None / 0 if no sweep)
+        self.collector = collector
+        self.collected = collected
+        self.game_over = status == GAME_OVER
+
+    @property
+    def burned_holes(self):
+        return mask_to_holes(self.burned_mask)
+
+    @property
+    def burns_created(self):
+        return self.burned_mask.bit_count()
+
+    @property
+    def head_gain(self):
+        """Change in the mover's head, including an end-of-game sweep into it"""
+        if self.collector == self.player:
+            return self.stones_captured + self.collected
+        return self.stones_captured
+
+    def __str__(self):
+        return self.status
+
+    def __repr__(self):
+        return (f"MoveResult({self.status!r}, player={self.player}, hole={self.hole}, last_hole={self.last_hole}, "
+                f"captured={self.stones_captured}, burned={self.burned_holes}, relays={self.relay_count})")
+
 
 class SungkaGame:
-    def __init__(self):
-        print("✅ Load Complete")
-        self.board = [7] * 7 + [0] + [7] * 7 + [0]
-        self.current_player = 0
-        self.burned_holes = {0: set(), 1: set()}
+    def __init__(self, event_sink=None):
+        # Engine events go to the sink; the default NullEventSink keeps the game silent
+        self.event_sink = event_sink if event_sink is not None else NullEventSink()
+        self.state = SungkaState()
         # Track performance metrics
         self.metrics = {
             "marbles_captured": 0,
@@ -15,95 +70,136 @@ class SungkaGame:
             "burned_suffered": 0,
             "moves": 0
         }
+        self.event_sink.load(self)
+
+    @classmethod
+    def from_bytes(cls, data, event_sink=None, metrics=None):
+        """Headless (unless event_sink is given) game positioned at a SungkaState.to_bytes() record"""
+        game = cls.__new__(cls)
+        game.event_sink = event_sink if event_sink is not None else NullEventSink()
+        game.state = SungkaState.from_bytes(data)
+        game.metrics = dict(metrics) if metrics is not None else {
+            "marbles_captured": 0,
+            "extra_turns": 0,
+            "burned_created": 0,
+            "burned_suffered": 0,
+            "moves": 0
+        }
+        return game
+
+    def to_bytes(self):
+        return self.state.to_bytes()
+
+    def __reduce__(self):
+        # Ship the 16-byte position plus metrics; the copy is headless (the sink stays behind)
+        return (SungkaGame.from_bytes, (self.to_bytes(), None, self.metrics))
+
+    # The board, side to move and burned holes live on self.state;
+    # these properties keep the original attribute API working.
+    @property
+    def board(self):
+        return self.state.board
+
+    @board.setter
+    def board(self, value):
+        self.state.board = list(value)
+        self.state.recount()
+
+    @property
+    def current_player(self):
+        return self.state.current_player
+
+    @current_player.setter
+    def current_player(self, value):
+        self.state.set_current_player(value)
+
+    @property
+    def burned_mask(self):
+        return self.state.burned_mask
+
+    @property
+    def zobrist_hash(self):
+        return self.state.zobrist_hash
+
+    @property
+    def side_totals(self):
+        return self.state.side_totals
+
+    @property
+    def occupied_mask(self):
+        return self.state.occupied_mask
+
+    @property
+    def active_holes(self):
+        return self.state.active_holes
+
+    @property
+    def burned_holes(self):
+        """Read-only {player: set(holes)} view of the burned mask"""
+        return {0: self.state.burned_holes_of(0), 1: self.state.burned_holes_of(1)}
 
     def is_valid_move(self, hole):
-        if hole in self.burned_holes[self.current_player]:
-            return False
-        if self.current_player == 0:
-            return 0 <= hole <= 6 and self.board[hole] > 0
-        else:
-            return 8 <= hole <= 14 and self.board[hole] > 0
+        return self.state.is_valid_move(hole)
+
+    def legal_mask(self, player=None):
+        """Bitmask of playable holes (iterate with game_state.iter_holes)"""
+        return self.state.legal_mask(player)
 
     
     def distribute_stones(self, starting_hole, show_intermediate=True):
-        current_hole = starting_hole
-        stones = self.board[current_hole]
-        self.board[current_hole] = 0
-        extra_turn = False
-        
-        # Track which holes were originally empty for Sunog rule
-        originally_empty_holes = set()
-        for i in range(16):
-            if self.board[i] == 0:
-                originally_empty_holes.add(i)
-        
-        while stones > 0:
-            current_hole = (current_hole + 1) % 16
-            
-            # Skip opponent's head
-            if (self.current_player == 0 and current_hole == 15) or \
-            (self.current_player == 1 and current_hole == 7):
-                continue
-                
-            # Skip burned holes for ALL players
-            if (current_hole in self.burned_holes[0] or 
-                current_hole in self.burned_holes[1]):
-                continue
-                
-            self.board[current_hole] += 1
-            stones -= 1
+        """
+        Sow from starting_hole (relays handled iteratively by game_state.sow).
+        Returns (last_hole, should_capture, extra_turn, originally_empty_holes, relay_count).
+        """
+        sink = self.event_sink
+
+        def report_leg(last_hole, relaying):
+            sink.sow(self, last_hole)
+            if relaying:
+                sink.relay(self, last_hole)
+
+        report = show_intermediate and not sink.silent
+        current_hole, relay_count = sow(self.board, starting_hole, self.current_player, self.state.burned_mask,
+                                        on_leg=report_leg if report else None, counts=self.state.counts)
 
-        if show_intermediate:
-            print("\n--- Intermediate Board State ---")
-            print(f"Last stone landed in hole {current_hole}")
-            self.print_board_state()
-        
         # Check for extra turn (landed in own head)
-        if (self.current_player == 0 and current_hole == 7) or \
-        (self.current_player == 1 and current_hole == 15):
-            extra_turn = True
-            return current_hole, False, extra_turn, originally_empty_holes
-        
-        # Check for relay (continue distribution)
-        if self.board[current_hole] > 1 and current_hole not in (7, 15):
-            if show_intermediate:
-                print(f"Continuing distribution from hole {current_hole}...")
-            return self.distribute_stones(current_hole, show_intermediate)
-        
+        if current_hole == HEADS[self.current_player]:
+            return current_hole, False, True, set(), relay_count
+
+        # The last leg stopped because its final stone made the hole hold exactly one,
+        # so the landing hole was empty when that leg began (originally empty for Sunog)
+        originally_empty_holes = {current_hole}
+
         # Check for capture (landed in own empty hole with stones in opposite hole)
         should_capture = (
-            (self.current_player == 0 and 0 <= current_hole <= 6 and 
-            current_hole in originally_empty_holes and self.board[14 - current_hole] > 0) or
-            (self.current_player == 1 and 8 <= current_hole <= 14 and 
-            current_hole in originally_empty_holes and self.board[14 - current_hole] > 0)
+            (self.current_player == 0 and 0 <= current_hole <= 6 and self.board[14 - current_hole] > 0) or
+            (self.current_player == 1 and 8 <= current_hole <= 14 and self.board[14 - current_hole] > 0)
         )
-        
-        return current_hole, should_capture, False, originally_empty_holes
+
+        return current_hole, should_capture, False, originally_empty_holes, relay_count
 
     def check_capture(self, last_hole):
+        """Capture (and burn last_hole) if the opposite hole holds stones; returns True if it did"""
         if self.current_player == 0 and 0 <= last_hole <= 6:
             opposite_hole = 14 - last_hole
             if self.board[opposite_hole] > 0:
-                captured_stones = self.board[last_hole] + self.board[opposite_hole]
-                self.board[7] += captured_stones
-                self.board[last_hole] = 0
-                self.board[opposite_hole] = 0
+                captured_stones = self.state.take_stones(last_hole) + self.state.take_stones(opposite_hole)
+                self.state.add_stones(7, captured_stones)
                 # 🔥 Burn after capture (Sunog)
-                self.burned_holes[0].add(last_hole)
-                print(f"Player 1 captured {captured_stones} stones from holes {last_hole} and {opposite_hole}")
-                print(f"🔥 SUNOG! Player 1's hole {last_hole} is now burned.")
+                self.state.burn(last_hole)
+                self.event_sink.capture(self, 0, last_hole, opposite_hole, captured_stones)
+                return True
 
         elif self.current_player == 1 and 8 <= last_hole <= 14:
             opposite_hole = 14 - last_hole
             if self.board[opposite_hole] > 0:
-                captured_stones = self.board[last_hole] + self.board[opposite_hole]
-                self.board[15] += captured_stones
-                self.board[last_hole] = 0
-                self.board[opposite_hole] = 0
+                captured_stones = self.state.take_stones(last_hole) + self.state.take_stones(opposite_hole)
+                self.state.add_stones(15, captured_stones)
                 # 🔥 Burn after capture (Sunog)
-                self.burned_holes[1].add(last_hole)
-                print(f"Player 2 captured {captured_stones} stones from holes {last_hole} and {opposite_hole}")
-                print(f"🔥 SUNOG! Player 2's hole {last_hole} is now burned.")
+                self.state.burn(last_hole)
+                self.event_sink.capture(self, 1, last_hole, opposite_hole, captured_stones)
+                return True
+        return False
 
 
     def apply_sunog_rule(self, last_hole, originally_empty_holes):
@@ -122,131 +218,104 @@ class SungkaGame:
             opposite_hole = 14 - last_hole
             if self.board[opposite_hole] == 0:  # Opposite hole is also empty
                 # Sunog occurs
-                seeds = self.board[last_hole]
-                self.board[last_hole] = 0
-                self.board[7] += seeds  # Give to opponent's head
-                self.burned_holes[0].add(last_hole)
+                seeds = self.state.take_stones(last_hole)
+                self.state.add_stones(7, seeds)  # Give to opponent's head
+                self.state.burn(last_hole)
                 burned = True
-                print(f"🔥 SUNOG! Player 1's hole {last_hole} burned. {seeds} seed(s) moved to Player 1's head.")
+                self.event_sink.sunog(self, 0, last_hole, seeds)
         
         elif self.current_player == 1 and 8 <= last_hole <= 14:
             # Player 2 landed in own originally empty hole  
             opposite_hole = 14 - last_hole
             if self.board[opposite_hole] == 0:  # Opposite hole is also empty
                 # Sunog occurs
-                seeds = self.board[last_hole]
-                self.board[last_hole] = 0
-                self.board[15] += seeds  # Give to opponent's head
-                self.burned_holes[1].add(last_hole)
+                seeds = self.state.take_stones(last_hole)
+                self.state.add_stones(15, seeds)  # Give to opponent's head
+                self.state.burn(last_hole)
                 burned = True
-                print(f"🔥 SUNOG! Player 2's hole {last_hole} burned. {seeds} seed(s) moved to Player 2's head.")
+                self.event_sink.sunog(self, 1, last_hole, seeds)
         
         return burned
 
 
 
     def is_game_over(self):
-        if self.current_player == 0:
-            return sum(self.board[0:7]) == 0
-        else:
-            return sum(self.board[8:15]) == 0
+        return self.state.is_game_over()
 
     def collect_remaining_stones(self):
         """
         Collect remaining stones when game ends:
         - If Player 1's side (0-6) is empty: Player 2 gets all remaining stones from their side (8-14)
         - If Player 2's side (8-14) is empty: Player 1 gets all remaining stones from their side (0-6)
+        Returns (collecting_player, stones) or None when nothing was collected.
         """
-        player1_stones = sum(self.board[0:7])
-        player2_stones = sum(self.board[8:15])
-        
-        if player1_stones == 0 and player2_stones > 0:
-            # Player 1's side is empty, Player 2 gets their remaining stones
-            self.board[15] += player2_stones
-            for i in range(8, 15):
-                self.board[i] = 0
-            print(f"Player 1's side is empty. Player 2 collects {player2_stones} remaining stones.")
-            
-        elif player2_stones == 0 and player1_stones > 0:
-            # Player 2's side is empty, Player 1 gets their remaining stones
-            self.board[7] += player1_stones
-            for i in range(0, 7):
-                self.board[i] = 0
-            print(f"Player 2's side is empty. Player 1 collects {player1_stones} remaining stones.")
-            
-        elif player1_stones == 0 and player2_stones == 0:
-            # Both sides empty (shouldn't normally happen, but just in case)
-            print("Both sides are empty. No stones to collect.")
-            
-        else:
-            # This shouldn't happen in normal game flow, but handle it
-            print(f"Warning: collect_remaining_stones called but both sides have stones (P1: {player1_stones}, P2: {player2_stones})")
+        player1_stones, player2_stones = self.state.side_totals
+        collected = self.state.collect_remaining_stones()
+        collector = collected[0] if collected is not None else None
+        self.event_sink.collect(self, player1_stones, player2_stones, collector)
+        return collected
 
     def get_valid_moves(self, player):
-        valid_moves = []
-        if player == 0:
-            for i in range(0, 7):
-                if self.is_valid_move(i):
-                    valid_moves.append(i)
-        else:
-            for i in range(8, 15):
-                if self.is_valid_move(i):
-                    valid_moves.append(i)
-        return valid_moves
+        return self.state.get_valid_moves(player)
 
     def get_winner(self):
-        if self.board[7] > self.board[15]:
-            return 0
-        elif self.board[15] > self.board[7]:
-            return 1
-        return None
+        return self.state.get_winner()
 
     def play_turn(self, hole):
-        before_burned = {0: set(self.burned_holes[0]), 1: set(self.burned_holes[1])}
-        before_score = (self.board[7], self.board[15])
+        """Play hole for the side to move and return a MoveResult describing the move"""
         current_player = self.current_player
 
         if self.is_game_over():
-            self.collect_remaining_stones()
-            self.print_metrics_summary()
-            return "Game Over"
+            collected = self.collect_remaining_stones()
+            self.event_sink.game_over(self)
+            return self._game_over_result(MoveResult(GAME_OVER, current_player, hole), collected)
 
         if not self.is_valid_move(hole):
             raise ValueError(f"Invalid move: Hole {hole} is not valid for Player {self.current_player + 1}")
 
-        last_hole, should_capture, extra_turn, originally_empty_holes = self.distribute_stones(hole)
+        head = HEADS[current_player]
+        head_before = self.board[head]
+        last_hole, should_capture, extra_turn, originally_empty_holes, relay_count = self.distribute_stones(hole)
 
         if should_capture:
-            self.check_capture(last_hole)
+            burned = self.check_capture(last_hole)
         else:
             # Only check Sunog if no capture occurred
-            self.apply_sunog_rule(last_hole, originally_empty_holes)
-
-        # Update metrics
-        after_burned = self.burned_holes
-        after_score = (self.board[7], self.board[15])
+            burned = self.apply_sunog_rule(last_hole, originally_empty_holes)
 
-        burned_created = len(after_burned[current_player] - before_burned[current_player])
-        burned_suffered = len(after_burned[1 - current_player] - before_burned[1 - current_player])
-        marbles_captured = (after_score[0] - before_score[0]) if current_player == 0 else (after_score[1] - before_score[1])
+        # Moves only ever burn the landing hole on the mover's own side
+        new_burns = 1 << last_hole if burned else 0
+        marbles_captured = self.board[head] - head_before
 
+        # Update metrics
         self.metrics["marbles_captured"] += max(0, marbles_captured)
         self.metrics["extra_turns"] += 1 if extra_turn else 0
-        self.metrics["burned_created"] += burned_created
-        self.metrics["burned_suffered"] += burned_suffered
+        self.metrics["burned_created"] += (new_burns & SIDE_MASKS[current_player]).bit_count()
+        self.metrics["burned_suffered"] += (new_burns & SIDE_MASKS[1 - current_player]).bit_count()
         self.metrics["moves"] += 1
 
+        result = MoveResult(TURN_COMPLETE, current_player, hole, last_hole, relay_count,
+                            marbles_captured, extra_turn, new_burns)
         if extra_turn:
-            return "Extra Turn"
+            result.status = EXTRA_TURN
+            return result
 
         self.current_player = 1 - self.current_player
 
         if self.is_game_over():
-            self.collect_remaining_stones()
-            self.print_metrics_summary()
-            return "Game Over"
+            collected = self.collect_remaining_stones()
+            self.event_sink.game_over(self)
+            return self._game_over_result(result, collected)
+
+        return result
 
-        return "Turn Complete"
+    @staticmethod
+    def _game_over_result(result, collected):
+        result.status = GAME_OVER
+        result.game_over = True
+        if collected is not None:
+            result.collector, result.collected = collected
+        return result
 
     def print_metrics_summary(self):
         print("\n=== PERFORMANCE METRICS SUMMARY ===")
@@ -279,7 +348,7 @@ class SungkaGame:
 
 
 def manual_test_game():
-    game = SungkaGame()
+    game = SungkaGame(event_sink=ConsoleEventSink())
     heuristic = SungkaHeuristic(game) 
 
     while True:
@@ -316,7 +385,7 @@ def manual_test_game():
             
             print(f"\n=== Turn Result: {result} ===")
             
-            if result == "Game Over":
+            if result.game_over:
                 game.print_board_state()
                 winner = game.get_winner()
                 if winner is not None:
@@ -330,7 +399,7 @@ def manual_test_game():
             continue
             
         # Pause between turns
-        if result != "Extra Turn":
+        if not result.extra_turn:
             input("\nPress Enter to continue to next turn...")
 
 def main():
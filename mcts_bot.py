@@ -0,0 +1,255 @@
+# mcts_bot.py
+"""
+Monte Carlo Tree Search (UCT) player.
+
+Each simulation copies the root SungkaState, walks the tree with UCT,
+expands one move, then plays a rollout to the end of the game with a cheap
+policy (mostly the Exact/Max policy: land in your own head if you can, else
+sow the fullest hole; a random move with probability rollout_epsilon). The
+result is backed up as win = 1, draw = 0.5, loss = 0 for the player who made
+each move, so extra turns (same side moving twice) need no special casing.
+
+The tree is kept between decisions: the next search starts from the node
+that matches the actual position (found by Zobrist hash below the move we
+played), so visits spent on the opponent's reply are reused.
+
+Searches stop on a simulation budget and/or a time budget. MCTSStats
+collects throughput (simulations and rollout moves per second) across bots.
+
+Usage (throughput benchmark):
+    python mcts_bot.py --games 10 --simulations 500
+"""
+import argparse
+import math
+import random
+import time
+
+from game_state import HEADS, mask_to_holes, sowing_path
+
+# How far below the previous root to look for the current position
+REUSE_SEARCH_DEPTH = 4
+
+
+class MCTSStats:
+    """Throughput counters shared by every MCTSBot of a run"""
+    def __init__(self):
+        self.decisions = 0
+        self.simulations = 0
+        self.rollout_moves = 0
+        self.reused_visits = 0
+        self.search_time = 0.0
+
+    def merge(self, other):
+        """Add another run's counters (e.g. from a worker process)"""
+        self.decisions += other.decisions
+        self.simulations += other.simulations
+        self.rollout_moves += other.rollout_moves
+        self.reused_visits += other.reused_visits
+        self.search_time += other.search_time
+
+    def report(self):
+        if self.decisions == 0:
+            return "MCTS: no decisions made"
+        rate = self.simulations / self.search_time if self.search_time > 0 else 0.0
+        move_rate = self.rollout_moves / self.search_time if self.search_time > 0 else 0.0
+        return (f"MCTS: {self.decisions} decisions, {self.simulations} simulations "
+                f"({self.simulations / self.decisions:.0f}/decision), "
+                f"{rate:,.0f} simulations/s, {move_rate:,.0f} rollout moves/s, "
+                f"{self.reused_visits} visits reused")
+
+
+class MCTSNode:
+    __slots__ = ("parent", "move", "mover", "key", "children", "untried", "visits", "wins", "terminal")
+
+    def __init__(self, parent, move, mover, state, terminal):
+        self.parent = parent
+        self.move = move
+        # Player who made move (None at a fresh root); wins are counted for them
+        self.mover = mover
+        self.key = state.zobrist_hash
+        self.children = []
+        self.untried = [] if terminal is not None else mask_to_holes(state.legal_mask())
+        self.visits = 0
+        self.wins = 0.0
+        # None, or player 0's reward when the game is over at this node
+        self.terminal = terminal
+
+
+def outcome(state, collect):
+    """Player 0's reward (1 / 0.5 / 0) for a finished game"""
+    margin = state.final_margin(0, collect)
+    if margin > 0:
+        return 1.0
+    if margin < 0:
+        return 0.0
+    return 0.5
+
+
+def rollout_move(state, rng, epsilon):
+    """Cheap rollout policy: Exact Policy (extra turn nearest the head), else Max Policy"""
+    moves = mask_to_holes(state.legal_mask())
+    if rng.random() < epsilon:
+        return rng.choice(moves)
+    player = state.current_player
+    board = state.board
+    path = sowing_path(player, state.burned_mask)
+    head = HEADS[player]
+    exact = [move for move in moves if path.landing(move, board[move]) == head]
+    if exact:
+        return max(exact) if player == 0 else min(exact)
+    return max(moves, key=board.__getitem__)
+
+
+class MCTSBot:
+    def __init__(self, player_index, simulations=1000, time_budget=None, exploration=1.4,
+                 rollout_epsilon=0.25, max_rollout_moves=200, rng=None, stats=None):
+        if simulations is None and not time_budget:
+            raise ValueError("MCTSBot needs a simulation budget and/or a time budget")
+        self.player_index = player_index
+        self.simulations = simulations
+        self.time_budget = time_budget
+        self.exploration = exploration
+        self.rollout_epsilon = rollout_epsilon
+        self.max_rollout_moves = max_rollout_moves
+        self.rng = rng if rng is not None else random.Random()
+        self.stats = stats if stats is not None else MCTSStats()
+        self.root = None
+
+    def get_move(self, game):
+        legal = game.legal_mask(self.player_index)
+        if not legal:
+            return None
+        state = game.state.copy()
+        state.set_current_player(self.player_index)
+
+        root = self.find_root(state)
+        if root is None:
+            root = MCTSNode(None, None, None, state, None)
+        else:
+            self.stats.reused_visits += root.visits
+            root.parent = None
+
+        start = time.perf_counter()
+        deadline = start + self.time_budget if self.time_budget else None
+        done = 0
+        while True:
+            self.run_simulation(root, state.copy())
+            done += 1
+            if self.simulations is not None and done >= self.simulations:
+                break
+            if deadline is not None and done & 15 == 0 and time.perf_counter() > deadline:
+                break
+
+        self.stats.decisions += 1
+        self.stats.simulations += done
+        self.stats.search_time += time.perf_counter() - start
+
+        best = max(root.children, key=lambda child: child.visits)
+        # Keep the subtree below our move for the next decision
+        self.root = best
+        return best.move
+
+    def find_root(self, state):
+        """Node of the previous tree that matches state, searched below the last move played"""
+        if self.root is None:
+            return None
+        key = state.zobrist_hash
+        frontier = [self.root]
+        for _ in range(REUSE_SEARCH_DEPTH + 1):
+            next_frontier = []
+            for node in frontier:
+                if node.key == key and node.terminal is None:
+                    return node
+                next_frontier.extend(node.children)
+            frontier = next_frontier
+        return None
+
+    def run_simulation(self, root, state):
+        node = root
+        # 1. Selection
+        while not node.untried and node.children:
+            node = self.select_child(node)
+            state.make_move(node.move)
+
+        # 2. Expansion
+        if node.untried and node.terminal is None:
+            move = node.untried.pop(self.rng.randrange(len(node.untried)))
+            mover = state.current_player
+            state.make_move(move)
+            terminal = None
+            if state.is_game_over():
+                terminal = outcome(state, collect=state.current_player != mover)
+            child = MCTSNode(node, move, mover, state, terminal)
+            node.children.append(child)
+            node = child
+
+        # 3. Rollout
+        reward = node.terminal if node.terminal is not None else self.rollout(state)
+
+        # 4. Backpropagation (reward is player 0's)
+        while node is not None:
+            node.visits += 1
+            if node.mover is not None:
+                node.wins += reward if node.mover == 0 else 1.0 - reward
+            node = node.parent
+
+    def select_child(self, node):
+        log_visits = math.log(node.visits)
+        exploration = self.exploration
+
+        def uct(child):
+            return child.wins / child.visits + exploration * math.sqrt(log_visits / child.visits)
+
+        return max(node.children, key=uct)
+
+    def rollout(self, state):
+        rng = self.rng
+        epsilon = self.rollout_epsilon
+        for ply in range(self.max_rollout_moves):
+            mover = state.current_player
+            state.make_move(rollout_move(state, rng, epsilon))
+            if state.is_game_over():
+                self.stats.rollout_moves += ply + 1
+                return outcome(state, collect=state.current_player != mover)
+        self.stats.rollout_moves += self.max_rollout_moves
+        # Move cap reached: score the material each side would collect
+        return outcome(state, collect=True)
+
+
+def benchmark(num_games=10, simulations=500, time_budget=None, seed=1):
+    """MCTS (random seat, random first mover) against the Exact/Max rollout policy; prints throughput"""
+    from main import SungkaGame
+
+    rng = random.Random(seed)
+    stats = MCTSStats()
+    wins = 0
+    start = time.perf_counter()
+    for _ in range(num_games):
+        game = SungkaGame()
+        mcts_player = rng.randrange(2)
+        game.current_player = rng.randrange(2)
+        bot = MCTSBot(mcts_player, simulations, time_budget, rng=random.Random(rng.getrandbits(64)), stats=stats)
+        while not game.is_game_over():
+            player = game.current_player
+            if player == mcts_player:
+                move = bot.get_move(game)
+            else:
+                move = rollout_move(game.state, rng, 0.0)
+            if game.play_turn(move).game_over:
+                break
+        if game.get_winner() == mcts_player:
+            wins += 1
+    elapsed = time.perf_counter() - start
+    print(f"Games: {num_games}  MCTS wins vs Exact/Max policy: {wins}/{num_games}  ({elapsed:.1f}s)")
+    print(stats.report())
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="MCTS bot throughput benchmark")
+    parser.add_argument("--games", type=int, default=10)
+    parser.add_argument("--simulations", type=int, default=500, help="simulation budget per decision")
+    parser.add_argument("--time", type=float, default=None, help="time budget per decision in seconds (replaces --simulations)")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    benchmark(args.games, None if args.time else args.simulations, args.time, args.seed)
@@ -1,5 +1,6 @@
 from main import SungkaGame
 from game_logger import GameLogger
+from game_events import ConsoleEventSink
 import os
 
 def play_game_with_detailed_recording():
@@ -10,7 +11,7 @@ def play_game_with_detailed_recording():
     custom_dir = input("Enter save directory (or press Enter for current directory): ").strip()
     save_dir = custom_dir if custom_dir else None
     
-    game = SungkaGame()
+    game = SungkaGame(event_sink=ConsoleEventSink())
     recorder = GameLogger(save_directory=save_dir)
     
     recorder.record_move(game, "Game Started")
@@ -26,50 +27,32 @@ def play_game_with_detailed_recording():
             hole = int(input(f"Player {game.current_player + 1}'s turn\n"
                            f"Choose a hole to distribute stones ({player_side}): "))
             
-            # Store state before move
+            # The logger wants the board as it was before the move
             board_before = game.board.copy()
-            score_before = (game.board[7], game.board[15])
-            burned_before = {0: set(game.burned_holes[0]), 1: set(game.burned_holes[1])}
-            current_player = game.current_player
             move_number += 1
             
             # Record basic move info
             recorder.record_move(game, "Turn Started", hole)
             
-            # Execute move
+            # Execute move; the result says what happened
             result = game.play_turn(hole)
-            
-            # Calculate what happened in this move
-            score_after = (game.board[7], game.board[15])
-            burned_after = game.burned_holes
-            
-            stones_captured = 0
-            if current_player == 0:
-                stones_captured = score_after[0] - score_before[0]
-            else:
-                stones_captured = score_after[1] - score_before[1]
-            
-            extra_turn = (result == "Extra Turn")
-            
-            # Find new burned holes
-            burned_holes_created = []
-            for player_idx in [0, 1]:
-                new_burns = burned_after[player_idx] - burned_before[player_idx]
-                burned_holes_created.extend(list(new_burns))
+            stones_captured = result.head_gain
+            extra_turn = result.extra_turn
+            burned_holes_created = result.burned_holes
             
             # Record detailed move
             recorder.record_detailed_move(
                 game=game,
                 hole_selected=hole,
                 board_before=board_before,
-                action_result=result,
+                action_result=result.status,
                 stones_captured=stones_captured,
                 extra_turn=extra_turn,
                 burned_holes_created=burned_holes_created
             )
             
             # Record result
-            recorder.record_move(game, result)
+            recorder.record_move(game, result.status)
             
             print(f"\n=== Turn {move_number} Result: {result} ===")
             if stones_captured > 0:
@@ -79,7 +62,7 @@ def play_game_with_detailed_recording():
             if extra_turn:
                 print("🎯 Extra turn earned!")
             
-            if result == "Game Over":
+            if result.game_over:
                 game.print_board_state()
                 winner = game.get_winner()
                 if winner is not None:
@@ -104,7 +87,7 @@ def play_game_with_detailed_recording():
             continue
         
         # Ask if player wants to continue (optional)
-        if result != "Game Over" and result != "Extra Turn":
+        if not result.game_over and not result.extra_turn:
             cont = input("\nPress Enter to continue (or 'q' to quit): ").lower().strip()
             if cont == 'q':
                 recorder.record_move(game, "Game Aborted by User")
@@ -121,7 +104,7 @@ def play_game_with_detailed_recording():
 
 def play_quick_game():
     """Quick game without detailed logging (original functionality)"""
-    game = SungkaGame()
+    game = SungkaGame(event_sink=ConsoleEventSink())
     recorder = GameLogger()
     
     recorder.record_move(game, "Game Started")
@@ -136,11 +119,11 @@ def play_quick_game():
             
             recorder.record_move(game, "Turn Started", hole)
             result = game.play_turn(hole)
-            recorder.record_move(game, result)
+            recorder.record_move(game, result.status)
             
             print("Turn result:", result)
             
-            if result == "Game Over":
+            if result.game_over:
                 game.print_board_state()
                 winner = game.get_winner()
                 if winner is not None:
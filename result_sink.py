@@ -0,0 +1,105 @@
+# result_sink.py
+"""
+Append-only CSV store for per-game simulation rows.
+
+Rows are buffered in memory and written to disk every buffer_size rows (and
+on flush/close), so a long run keeps a bounded buffer and a crash loses at
+most one buffer of games. The header is taken from the first row written.
+A flush that is interrupted part-way (Ctrl+C, an error) cuts the file back
+to where it started and keeps the rows buffered, so flushing again never
+writes a row twice. A sink opened with resume_rows keeps the first
+resume_rows rows of an existing file (e.g. the count saved in a
+checkpoint) and appends after them.
+
+The file is read back lazily with read_chunks(), which yields DataFrames of
+at most chunksize rows; read() loads everything at once (small runs, Excel
+export).
+"""
+import csv
+import os
+
+import pandas as pd
+
+# Columns holding comma-separated hole lists ('' when empty); read back as text
+TEXT_COLUMNS = ('burned_holes_p0', 'burned_holes_p1')
+
+
+class CSVResultSink:
+    def __init__(self, path, buffer_size=1000, resume_rows=None):
+        if buffer_size <= 0:
+            raise ValueError(f"buffer_size must be positive, got {buffer_size}")
+        self.path = path
+        self.buffer_size = buffer_size
+        self.buffer = []
+        self.fieldnames = None
+        self.rows_written = 0
+        if resume_rows is None:
+            # Start a fresh file
+            open(self.path, 'w', newline='').close()
+        else:
+            self.truncate(resume_rows)
+
+    def truncate(self, rows):
+        """Keep the header and the first rows data rows, dropping anything written after them"""
+        with open(self.path, 'r+b') as f:
+            header = f.readline()
+            if header:
+                self.fieldnames = next(csv.reader([header.decode()]))
+            for _ in range(rows):
+                if not f.readline().endswith(b'\n'):
+                    raise ValueError(f"{self.path} holds fewer than {rows} complete rows")
+            f.truncate(f.tell())
+        self.rows_written = rows
+
+    def __len__(self):
+        return self.rows_written + len(self.buffer)
+
+    def append(self, row):
+        self.buffer.append(row)
+        if len(self.buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        """Write buffered rows to disk (all of them, or none if interrupted)"""
+        if not self.buffer:
+            return
+        write_header = self.fieldnames is None
+        fieldnames = list(self.buffer[0]) if write_header else self.fieldnames
+        with open(self.path, 'a', newline='') as f:
+            start = f.tell()
+            try:
+                writer = csv.DictWriter(f, fieldnames=fieldnames)
+                if write_header:
+                    writer.writeheader()
+                writer.writerows(self.buffer)
+                f.flush()
+                os.fsync(f.fileno())
+            except BaseException:
+                # Drop the partial write; the rows stay buffered for the next flush
+                f.truncate(start)
+                raise
+        self.fieldnames = fieldnames
+        self.rows_written += len(self.buffer)
+        self.buffer.clear()
+
+    def close(self):
+        self.flush()
+
+    def read_chunks(self, chunksize=10000, columns=None):
+        """Yield the stored rows as DataFrames of at most chunksize rows"""
+        self.flush()
+        if self.rows_written == 0:
+            return
+        text_columns = [c for c in TEXT_COLUMNS if columns is None or c in columns]
+        for chunk in pd.read_csv(self.path, usecols=columns, chunksize=chunksize,
+                                 dtype={c: str for c in text_columns}):
+            for column in text_columns:
+                chunk[column] = chunk[column].fillna('')
+            yield chunk
+
+    def read(self, columns=None):
+        """All stored rows as one DataFrame"""
+        chunks = list(self.read_chunks(columns=columns))
+        if not chunks:
+            return pd.DataFrame()
+        return pd.concat(chunks, ignore_index=True)
@@ -0,0 +1,122 @@
+# run_telemetry.py
+"""
+Live throughput telemetry for simulation runs.
+
+RunTelemetry counts finished games, moves (both players) and heuristic
+decisions. At most every interval seconds it prints one progress line
+(games/s, moves/s, heuristic decisions/s, ETA) and appends a snapshot to a
+JSONL file. Rates are given over the whole run and over the last interval,
+so a mid-run slowdown shows up in the 'recent' figures.
+
+One RunTelemetry can be shared by several Simulators (e.g. one per opponent
+type); every snapshot then carries a per-opponent breakdown.
+"""
+import json
+import time
+
+
+class _Counters:
+    __slots__ = ("games", "moves", "heuristic_decisions", "seconds")
+
+    def __init__(self):
+        self.games = 0
+        self.moves = 0
+        self.heuristic_decisions = 0
+        self.seconds = 0.0
+
+    def rates(self, seconds):
+        if seconds <= 0:
+            return {'games_per_s': 0.0, 'moves_per_s': 0.0, 'heuristic_decisions_per_s': 0.0}
+        return {
+            'games_per_s': self.games / seconds,
+            'moves_per_s': self.moves / seconds,
+            'heuristic_decisions_per_s': self.heuristic_decisions / seconds,
+        }
+
+
+class RunTelemetry:
+    def __init__(self, interval=10.0, clock=time.perf_counter):
+        self.interval = interval
+        self.clock = clock
+        # Opponent name -> counters over every run reported through this object
+        self.by_opponent = {}
+        self.opponent = None
+        self.jsonl_path = None
+
+    def start_run(self, opponent, total_games, games_done=0, jsonl_path=None, run_info=None):
+        """Begin a run of total_games (games_done of them finished in an earlier session)"""
+        self.opponent = opponent
+        self.total_games = total_games
+        self.games_done = games_done
+        self.jsonl_path = jsonl_path
+        self.run_info = run_info or {}
+        self.run = _Counters()
+        self.recent = _Counters()
+        self.by_opponent.setdefault(opponent, _Counters())
+        self.run_start = self.last_report = self.clock()
+        self.write(self.snapshot('run_start', self.run_start))
+
+    def record_game(self, moves, heuristic_decisions):
+        for counters in (self.run, self.recent, self.by_opponent[self.opponent]):
+            counters.games += 1
+            counters.moves += moves
+            counters.heuristic_decisions += heuristic_decisions
+        if self.interval is not None and self.clock() - self.last_report >= self.interval:
+            self.report()
+
+    def end_run(self):
+        self.report('run_end')
+        self.by_opponent[self.opponent].seconds += self.clock() - self.run_start
+        self.opponent = None
+
+    def eta(self, now):
+        """Seconds left in the run at the overall game rate (None before the first game)"""
+        elapsed = now - self.run_start
+        if self.run.games == 0 or elapsed <= 0:
+            return None
+        remaining = self.total_games - self.games_done - self.run.games
+        return max(0, remaining) * elapsed / self.run.games
+
+    def snapshot(self, event, now):
+        elapsed = now - self.run_start
+        breakdown = {}
+        for opponent, counters in self.by_opponent.items():
+            seconds = counters.seconds + (elapsed if opponent == self.opponent else 0.0)
+            breakdown[opponent] = {'games': counters.games, 'moves': counters.moves,
+                                   'heuristic_decisions': counters.heuristic_decisions,
+                                   'seconds': seconds, **counters.rates(seconds)}
+        return {
+            'event': event,
+            'time': time.time(),
+            **self.run_info,
+            'opponent': self.opponent,
+            'games_done': self.games_done + self.run.games,
+            'total_games': self.total_games,
+            'elapsed': elapsed,
+            'eta': self.eta(now),
+            'games': self.run.games,
+            'moves': self.run.moves,
+            'heuristic_decisions': self.run.heuristic_decisions,
+            **self.run.rates(elapsed),
+            'recent': self.recent.rates(now - self.last_report),
+            'by_opponent': breakdown,
+        }
+
+    def report(self, event='progress'):
+        now = self.clock()
+        snapshot = self.snapshot(event, now)
+        eta = snapshot['eta']
+        print(f"⏱️ {snapshot['games_done']}/{self.total_games} games | "
+              f"{snapshot['games_per_s']:.1f} games/s (recent {snapshot['recent']['games_per_s']:.1f}) | "
+              f"{snapshot['moves_per_s']:,.0f} moves/s | "
+              f"{snapshot['heuristic_decisions_per_s']:,.0f} heuristic decisions/s | "
+              f"ETA {'n/a' if eta is None else f'{eta:.0f}s'}")
+        self.write(snapshot)
+        self.recent = _Counters()
+        self.last_report = now
+
+    def write(self, snapshot):
+        if self.jsonl_path is None:
+            return
+        with open(self.jsonl_path, 'a') as f:
+            f.write(json.dumps(snapshot) + '\n')
@@ -0,0 +1,185 @@
+# search_bot.py
+"""
+Alpha-beta search player.
+
+Iterative-deepening negamax over SungkaState (make_move/unmake_move, no board
+copies) with:
+  - extra turns: when the last stone lands in the mover's head the same side
+    moves again, so the child value is NOT negated (the ply still counts
+    towards the depth, which keeps extra-turn chains finite),
+  - leaf evaluation by the heuristic: a frontier node is worth the best
+    heuristic move score for its side to move (evaluate_all_moves with no
+    Variation term, so the search is deterministic),
+  - move ordering: transposition-table move first, then extra turns, then
+    captures, then the fullest holes,
+  - a transposition table keyed by the Zobrist hash (exact / lower / upper
+    bounds), rebuilt for every decision,
+  - a node budget and an optional time budget per decision; the move from
+    the deepest fully searched iteration is played.
+"""
+import time
+
+from game_state import HEADS, SIDE_MASKS, iter_holes, sowing_path
+from more_balanced_heuristic import evaluate_all_moves as default_evaluate_all_moves
+
+WIN_SCORE = 10000
+
+# Transposition-table bound types
+EXACT = 0
+LOWER = 1
+UPPER = 2
+
+
+class _BudgetExhausted(Exception):
+    pass
+
+
+class AlphaBetaBot:
+    """Iterative-deepening negamax player using the heuristic at the leaves"""
+    def __init__(self, player_index, max_depth=6, node_budget=5000, time_budget=None,
+                 evaluate_all_moves=None, cache=None):
+        self.player_index = player_index
+        self.max_depth = max_depth
+        self.node_budget = node_budget
+        self.time_budget = time_budget
+        self.evaluate_all_moves = evaluate_all_moves or default_evaluate_all_moves
+        # Optional EvaluationCache shared with the heuristic players
+        self.cache = cache
+        # Stats of the last decision
+        self.nodes = 0
+        self.depth_reached = 0
+        self.tt_hits = 0
+
+    def get_move(self, game):
+        legal = game.legal_mask(self.player_index)
+        if not legal:
+            return None
+        moves = list(iter_holes(legal))
+        if len(moves) == 1:
+            return moves[0]
+
+        state = game.state.copy()
+        state.set_current_player(self.player_index)
+        self.moves_played = game.metrics['moves']
+        self.table = {}
+        self.nodes = 0
+        self.tt_hits = 0
+        self.depth_reached = 0
+        self.deadline = time.perf_counter() + self.time_budget if self.time_budget else None
+
+        best_move = self.order_moves(state, moves, None)[0]
+        for depth in range(1, self.max_depth + 1):
+            try:
+                _, move = self.search_root(state, moves, depth, best_move)
+            except _BudgetExhausted:
+                break
+            best_move = move
+            self.depth_reached = depth
+        return best_move
+
+    def search_root(self, state, moves, depth, first_move):
+        player = state.current_player
+        alpha, beta = -float('inf'), float('inf')
+        best_value, best_move = -float('inf'), first_move
+        for move in self.order_moves(state, moves, first_move):
+            undo = state.make_move(move)
+            try:
+                value = self.child_value(state, player, depth - 1, alpha, beta)
+            finally:
+                state.unmake_move(undo)
+            if value > best_value:
+                best_value, best_move = value, move
+            alpha = max(alpha, value)
+        return best_value, best_move
+
+    def child_value(self, state, mover, depth, alpha, beta):
+        """Value of the position after mover's move, from mover's point of view"""
+        extra_turn = state.current_player == mover
+        if state.is_game_over():
+            # Same ending as a simulated game: after a normal move the side that still
+            # has stones collects them; an extra turn that emptied the mover's side
+            # ends the game with no collection
+            return self.final_value(state, mover, collect=not extra_turn)
+        if extra_turn:
+            # Same side to move: no negation, same window
+            return self.negamax(state, depth, alpha, beta)
+        return -self.negamax(state, depth, -beta, -alpha)
+
+    def negamax(self, state, depth, alpha, beta):
+        self.nodes += 1
+        if self.nodes > self.node_budget:
+            raise _BudgetExhausted
+        if self.deadline is not None and self.nodes & 255 == 0 and time.perf_counter() > self.deadline:
+            raise _BudgetExhausted
+
+        player = state.current_player
+        if depth <= 0:
+            _, scores, _ = self.evaluate_all_moves(state, player, self.moves_played, None, cache=self.cache)
+            return max(scores)
+
+        key = state.zobrist_hash
+        entry = self.table.get(key)
+        tt_move = None
+        if entry is not None:
+            entry_depth, entry_value, entry_bound, tt_move = entry
+            if entry_depth >= depth:
+                self.tt_hits += 1
+                if entry_bound == EXACT:
+                    return entry_value
+                if entry_bound == LOWER and entry_value >= beta:
+                    return entry_value
+                if entry_bound == UPPER and entry_value <= alpha:
+                    return entry_value
+
+        original_alpha = alpha
+        best_value, best_move = -float('inf'), None
+        for move in self.order_moves(state, list(iter_holes(state.legal_mask())), tt_move):
+            undo = state.make_move(move)
+            try:
+                value = self.child_value(state, player, depth - 1, alpha, beta)
+            finally:
+                state.unmake_move(undo)
+            if value > best_value:
+                best_value, best_move = value, move
+            if value > alpha:
+                alpha = value
+            if alpha >= beta:
+                break
+
+        if best_value <= original_alpha:
+            bound = UPPER
+        elif best_value >= beta:
+            bound = LOWER
+        else:
+            bound = EXACT
+        self.table[key] = (depth, best_value, bound, best_move)
+        return best_value
+
+    def final_value(self, state, player, collect):
+        """Win/loss score plus the final head margin for player"""
+        margin = state.final_margin(player, collect)
+        if margin > 0:
+            return WIN_SCORE + margin
+        if margin < 0:
+            return -WIN_SCORE + margin
+        return 0
+
+    def order_moves(self, state, moves, tt_move):
+        """TT move, then extra turns, then captures, then holes with the most stones"""
+        board = state.board
+        player = state.current_player
+        path = sowing_path(player, state.burned_mask)
+        head = HEADS[player]
+        own_side = SIDE_MASKS[player]
+
+        def priority(move):
+            if move == tt_move:
+                return (0, 0)
+            landing = path.landing(move, board[move])
+            if landing == head:
+                return (1, -board[move])
+            if own_side >> landing & 1 and board[landing] == 0 and board[14 - landing] > 0:
+                return (2, -board[14 - landing])
+            return (3, -board[move])
+
+        return sorted(moves, key=priority)
@@ -0,0 +1,171 @@
+# sprt.py
+"""
+Sequential probability ratio test on game results.
+
+H0: the heuristic's Elo advantage over the opponent is elo0.
+H1: it is elo1 (logistic Elo: expected score 1 / (1 + 10 ** (-elo / 400))).
+
+Results are scored win = 1, draw = 0.5, loss = 0. The log-likelihood ratio
+uses the normal approximation with the variance measured from the games
+themselves, so draws count as half a point and narrow the variance instead
+of being dropped:
+
+    LLR = (s1 - s0) * (2 * score - s0 - s1) / (2 * variance / games)
+
+The variance (and the score inside the LLR) is taken over the counts plus
+one pseudo-game scored half a win and half a loss. Without it a one-sided
+run (every game won, or every game lost) has zero variance and the test
+could never stop, exactly where stopping early saves the most.
+
+The test stops when LLR leaves [log(beta / (1 - alpha)), log((1 - beta) / alpha)]:
+below accepts H0, above accepts H1. alpha and beta are the false positive
+and false negative rates.
+
+SPRT treats every game as an independent (trinomial) observation. The two
+games of a seat-swapped pair share their random streams, so they are not
+independent; PairSPRT takes one observation per pair instead, scored as the
+heuristic's points over both games / 2 (pentanomial: 0, 0.25, ..., 1), and
+the same formula runs over pairs with the variance of the pair scores.
+"""
+import argparse
+import math
+
+# Regularising prior added to the observations in llr(): half a pseudo-observation at score 1, half at 0
+PRIOR_WINS = 0.5
+PRIOR_LOSSES = 0.5
+
+H0_ACCEPTED = "H0 accepted"
+H1_ACCEPTED = "H1 accepted"
+
+
+def expected_score(elo):
+    return 1 / (1 + 10 ** (-elo / 400))
+
+
+def elo_from_score(score):
+    if score <= 0:
+        return -float('inf')
+    if score >= 1:
+        return float('inf')
+    return -400 * math.log10(1 / score - 1)
+
+
+class SPRT:
+    def __init__(self, elo0=0.0, elo1=10.0, alpha=0.05, beta=0.05):
+        if elo1 <= elo0:
+            raise ValueError(f"elo1 must be greater than elo0, got elo0={elo0}, elo1={elo1}")
+        if not (0 < alpha < 1 and 0 < beta < 1):
+            raise ValueError(f"alpha and beta must be in (0, 1), got alpha={alpha}, beta={beta}")
+        self.elo0 = elo0
+        self.elo1 = elo1
+        self.alpha = alpha
+        self.beta = beta
+        self.lower = math.log(beta / (1 - alpha))
+        self.upper = math.log((1 - beta) / alpha)
+        self.wins = 0
+        self.draws = 0
+        self.losses = 0
+
+    @property
+    def games(self):
+        return self.wins + self.draws + self.losses
+
+    def samples(self):
+        """Independent observations so far"""
+        return self.games
+
+    def observations(self):
+        """(score, count) pairs the LLR is taken over, prior included"""
+        return [(1.0, self.wins + PRIOR_WINS), (0.5, self.draws), (0.0, self.losses + PRIOR_LOSSES)]
+
+    def record(self, heuristic_won):
+        """Add one game (True = win, None = draw, False = loss, as in the result rows)"""
+        if heuristic_won is None:
+            self.draws += 1
+        elif heuristic_won:
+            self.wins += 1
+        else:
+            self.losses += 1
+
+    def score(self):
+        return (self.wins + 0.5 * self.draws) / self.games if self.games else 0.5
+
+    def llr(self):
+        if self.samples() == 0:
+            return 0.0
+        observations = self.observations()
+        count = sum(weight for _, weight in observations)
+        score = sum(value * weight for value, weight in observations) / count
+        variance = sum(value * value * weight for value, weight in observations) / count - score ** 2
+        s0 = expected_score(self.elo0)
+        s1 = expected_score(self.elo1)
+        return (s1 - s0) * (2 * score - s0 - s1) / (2 * variance / count)
+
+    def decision(self):
+        """H0_ACCEPTED, H1_ACCEPTED or None while the test is still running"""
+        llr = self.llr()
+        if llr <= self.lower:
+            return H0_ACCEPTED
+        if llr >= self.upper:
+            return H1_ACCEPTED
+        return None
+
+    def report(self):
+        decision = self.decision() or "continue"
+        return (f"SPRT elo0={self.elo0:g} elo1={self.elo1:g} alpha={self.alpha:g} beta={self.beta:g}: "
+                f"LLR {self.llr():+.3f} [{self.lower:.3f}, {self.upper:.3f}] -> {decision} "
+                f"(W-D-L {self.wins}-{self.draws}-{self.losses}, Elo {elo_from_score(self.score()):+.1f})")
+
+
+class PairSPRT(SPRT):
+    """
+    SPRT over seat-swapped pairs. Games are recorded one at a time, in order
+    (games 2k-1 and 2k form pair k); the test only moves when a pair completes.
+    """
+    def __init__(self, elo0=0.0, elo1=10.0, alpha=0.05, beta=0.05):
+        super().__init__(elo0, elo1, alpha, beta)
+        # Pairs by the heuristic's points over both games: 0, 0.5, 1, 1.5, 2
+        self.pentanomial = [0] * 5
+        self.pending = None
+
+    def record(self, heuristic_won):
+        super().record(heuristic_won)
+        points = 0.5 if heuristic_won is None else float(bool(heuristic_won))
+        if self.pending is None:
+            self.pending = points
+        else:
+            self.pentanomial[int(2 * (self.pending + points))] += 1
+            self.pending = None
+
+    def samples(self):
+        return sum(self.pentanomial)
+
+    def observations(self):
+        observations = [(index / 4, count) for index, count in enumerate(self.pentanomial)]
+        return observations + [(1.0, PRIOR_WINS), (0.0, PRIOR_LOSSES)]
+
+    def report(self):
+        pairs = "-".join(str(count) for count in self.pentanomial)
+        return super().report().replace("SPRT ", "Pair SPRT ", 1) + f" pairs 0-0.5-1-1.5-2 points: {pairs}"
+
+
+def check_one_sided(games=30, elo0=0.0, elo1=20.0, test=SPRT):
+    """An unbroken run of wins must accept H1 and of losses H0 within games games"""
+    for heuristic_won, expected in ((True, H1_ACCEPTED), (False, H0_ACCEPTED)):
+        sprt = test(elo0, elo1)
+        for _ in range(games):
+            sprt.record(heuristic_won)
+            if sprt.decision():
+                break
+        print(sprt.report())
+        assert sprt.decision() == expected, f"{games} straight {'wins' if heuristic_won else 'losses'} gave {sprt.decision()}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check the SPRT stops on one-sided results")
+    parser.add_argument("--games", type=int, default=30)
+    args = parser.parse_args()
+    for test in (SPRT, PairSPRT):
+        for elo0, elo1 in ((0.0, 10.0), (0.0, 20.0), (-10.0, 10.0)):
+            check_one_sided(args.games, elo0, elo1, test)
+    print("✅ one-sided runs stop")